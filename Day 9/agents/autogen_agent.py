@@ -13,6 +13,58 @@ except ImportError:
     logger.warning("AutoGen not available, using fallback message generation")
     AUTOGEN_AVAILABLE = False
 
+# Fallback outreach templates, filled with str.format_map
+HARDCODED_TEMPLATES = {
+    "linkedin": """Hi {alumni_name},
+
+I hope this message finds you well. I'm {student_name}, a {student_major} student graduating soon, and I came across your profile while researching professionals at {alumni_company}.
+
+I'm very interested in opportunities in your field and would greatly appreciate any insights you might have about {alumni_company} or the industry in general. Your experience as a {alumni_role} is exactly the kind of career path I'm hoping to pursue.
+
+Would you be open to a brief conversation? I'd be happy to work around your schedule.
+
+Thank you for your time and consideration.
+
+Best regards,
+{student_name}""",
+
+    "email": """Subject: {student_major} Student Seeking Career Guidance
+
+Dear {alumni_name},
+
+I hope this email finds you well. My name is {student_name}, and I'm a {student_major} student graduating soon. I discovered your profile while researching professionals at {alumni_company}, and I was impressed by your career journey to your current role as {alumni_role}.
+
+I'm currently seeking opportunities in the tech industry and would be incredibly grateful for any advice or insights you might be willing to share about your experience at {alumni_company} or the field in general.
+
+I understand how valuable your time is, so I'd be happy to accommodate your schedule for a brief phone call or coffee meeting.
+
+Thank you very much for considering my request.
+
+Warm regards,
+{student_name}
+[Contact Information]""",
+
+    "followup": """Hi {alumni_name},
+
+I hope you're doing well. I wanted to follow up on my previous message about seeking career guidance.
+
+I understand you must be very busy, but if you have just 10-15 minutes in the coming weeks, I would be incredibly grateful for any insights you could share about your experience at {alumni_company}.
+
+Thank you again for your time and consideration.
+
+Best regards,
+{student_name}""",
+
+    "thankyou": """Dear {alumni_name},
+
+Thank you so much for taking the time to speak with me and for your valuable insights about {alumni_company} and the industry. Your guidance was incredibly helpful and has given me a much clearer direction for my career path.
+
+I truly appreciate your support and willingness to help. I'll keep you updated on my progress and hope to pay it forward someday.
+
+With sincere gratitude,
+{student_name}"""
+}
+
 class AutoGenOutreachAgent(BaseAgent):
     """Outreach Message Generator Agent using AutoGen or fallback"""
     
@@ -305,64 +357,18 @@ Generate only the message content, no explanations."""
         student = context.get("student", {})
         alumni = context.get("alumni", {})
         
-        student_name = student.get("name", "Student Name")
-        alumni_name = alumni.get("name", "Alumni Name")
-        alumni_company = alumni.get("current_company", "Company")
-        alumni_role = alumni.get("current_role", "Role")
-        student_major = student.get("major", "Computer Science")
-        
-        templates = {
-            "linkedin": f"""Hi {alumni_name},
-
-I hope this message finds you well. I'm {student_name}, a {student_major} student graduating soon, and I came across your profile while researching professionals at {alumni_company}.
-
-I'm very interested in opportunities in your field and would greatly appreciate any insights you might have about {alumni_company} or the industry in general. Your experience as a {alumni_role} is exactly the kind of career path I'm hoping to pursue.
-
-Would you be open to a brief conversation? I'd be happy to work around your schedule.
-
-Thank you for your time and consideration.
-
-Best regards,
-{student_name}""",
-            
-            "email": f"""Subject: {student_major} Student Seeking Career Guidance
-
-Dear {alumni_name},
-
-I hope this email finds you well. My name is {student_name}, and I'm a {student_major} student graduating soon. I discovered your profile while researching professionals at {alumni_company}, and I was impressed by your career journey to your current role as {alumni_role}.
-
-I'm currently seeking opportunities in the tech industry and would be incredibly grateful for any advice or insights you might be willing to share about your experience at {alumni_company} or the field in general.
-
-I understand how valuable your time is, so I'd be happy to accommodate your schedule for a brief phone call or coffee meeting.
-
-Thank you very much for considering my request.
-
-Warm regards,
-{student_name}
-[Contact Information]""",
-            
-            "followup": f"""Hi {alumni_name},
-
-I hope you're doing well. I wanted to follow up on my previous message about seeking career guidance.
-
-I understand you must be very busy, but if you have just 10-15 minutes in the coming weeks, I would be incredibly grateful for any insights you could share about your experience at {alumni_company}.
-
-Thank you again for your time and consideration.
-
-Best regards,
-{student_name}""",
-            
-            "thankyou": f"""Dear {alumni_name},
-
-Thank you so much for taking the time to speak with me and for your valuable insights about {alumni_company} and the industry. Your guidance was incredibly helpful and has given me a much clearer direction for my career path.
-
-I truly appreciate your support and willingness to help. I'll keep you updated on my progress and hope to pay it forward someday.
-
-With sincere gratitude,
-{student_name}"""
-        }
-        
-        return templates.get(message_type, "Thank you for your consideration.")
+        # Only the requested template is filled in
+        template = HARDCODED_TEMPLATES.get(message_type)
+        if template is None:
+            return "Thank you for your consideration."
+        
+        return template.format_map({
+            "student_name": student.get("name", "Student Name"),
+            "alumni_name": alumni.get("name", "Alumni Name"),
+            "alumni_company": alumni.get("current_company", "Company"),
+            "alumni_role": alumni.get("current_role", "Role"),
+            "student_major": student.get("major", "Computer Science")
+        })
     
     async def _generate_message_variation(self, context: Dict[str, Any], 
                                         message_type: str, description: str) -> Dict[str, Any]:
@@ -17,6 +17,9 @@ class BaseAgent(ABC):
         self.db_client = MongoDBClient()
         self.db_client.connect()
         
+        # Agents that search alumni by similarity set their own RAG pipeline
+        self.rag_pipeline = None
+        
         # Configure Gemini
         genai.configure(api_key=self.config["GOOGLE_API_KEY"])
         self.model = genai.GenerativeModel(self.config["GEMINI_MODEL"])
@@ -111,6 +114,18 @@ class BaseAgent(ABC):
         
         return list(set(keywords))
     
+    def search_alumni_with_rag(self, query: str, limit: int = 10,
+                               filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Search alumni using the agent's RAG pipeline; [] if the agent has none"""
+        if self.rag_pipeline is None:
+            return []
+        
+        try:
+            return self.rag_pipeline.search(query, limit, filters)
+        except Exception as e:
+            logger.error("Error searching alumni with RAG in %s: %s", self.agent_name, e)
+            return []
+    
     def close(self):
         """Close agent resources"""
         if self.db_client:
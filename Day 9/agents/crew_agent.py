@@ -66,6 +66,7 @@ class CrewAlumniAgent(BaseAgent):
     
     def __init__(self):
         super().__init__("CrewAI Alumni Mining Agent")
+        # Loads its model and store on first use; load errors are logged there
         self.rag_pipeline = RAGPipeline()
         self.linkedin_scraper = LinkedInScraper()
         self._setup_crew()
@@ -178,7 +179,7 @@ class CrewAlumniAgent(BaseAgent):
             }
             
         except Exception as e:
-            logger.error(f"Error in CrewAI alumni mining: {e}")
+            logger.error("Error in CrewAI alumni mining: %s", e)
             self.log_activity("Error in alumni mining", {"error": str(e)})
             return {
                 "success": False,
@@ -250,7 +251,7 @@ class CrewAlumniAgent(BaseAgent):
             return alumni_profiles
             
         except Exception as e:
-            logger.error(f"Error processing crew results: {e}")
+            logger.error("Error processing crew results: %s", e)
             return []
     
     async def _store_in_rag(self, alumni_data: List[Dict[str, Any]]):
@@ -280,12 +281,4 @@ class CrewAlumniAgent(BaseAgent):
                 )
                 
         except Exception as e:
-            logger.error(f"Error storing alumni data in RAG: {e}")
-    
-    def search_alumni_with_rag(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
-        """Search alumni using RAG pipeline"""
-        try:
-            return self.rag_pipeline.search(query, limit)
-        except Exception as e:
-            logger.error(f"Error searching alumni with RAG: {e}")
-            return []
\ No newline at end of file
+            logger.error("Error storing alumni data in RAG: %s", e)
\ No newline at end of file
@@ -3,14 +3,44 @@ from langchain.tools import Tool
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain.prompts import PromptTemplate
 from langchain.schema import BaseOutputParser
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Pattern, Tuple
+import asyncio
 import logging
 import json
+import re
 import numpy as np
 from agents.base_agent import BaseAgent
+from rag.rag_pipeline import RAGPipeline
 
 logger = logging.getLogger(__name__)
 
+# Try to import orjson for faster JSON decoding, fallback to stdlib json
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Score lines emitted by the agent in non-JSON output, e.g. "Match: 0.85"
+_SCORE_RE = re.compile(r"(?:Score|Match):\s*([\d.]+)")
+
+# Related role titles that count as a partial role match
+ROLE_KEYWORDS = {
+    "engineer": ("engineer", "developer", "programmer", "architect"),
+    "manager": ("manager", "lead", "director", "head"),
+    "analyst": ("analyst", "researcher", "scientist"),
+    "consultant": ("consultant", "advisor", "strategist")
+}
+
+CURRENT_YEAR = 2024
+
+# Alumni fields read while scoring and assessing referral potential
+ALUMNI_TEXT_FIELDS = ("current_company", "current_role", "industry")
+ALUMNI_NUMERIC_FIELDS = ("years_of_experience", "referral_count_this_month", "max_referrals_per_month")
+
+# Weights for skill, company, role, experience and industry scores
+MATCH_WEIGHTS = np.array([0.3, 0.25, 0.2, 0.15, 0.1])
+
 class MatchingOutputParser(BaseOutputParser):
     """Custom output parser for domain alignment results"""
     
@@ -18,36 +48,31 @@ class MatchingOutputParser(BaseOutputParser):
         """Parse the agent output into structured data"""
         try:
             # Try to extract JSON if present
-            if "{" in text and "}" in text:
-                start = text.find("{")
-                end = text.rfind("}") + 1
-                json_str = text[start:end]
-                return json.loads(json_str)
+            start = text.find("{")
+            end = text.rfind("}")
+            if start != -1 and end != -1:
+                return _json_loads(text[start:end + 1])
             
             # Fallback parsing
-            lines = text.strip().split('\n')
             result = {
                 "matches": [],
                 "reasoning": text,
                 "confidence": 0.7
             }
             
-            for line in lines:
-                if "Score:" in line or "Match:" in line:
-                    # Extract match information
-                    parts = line.split(':')
-                    if len(parts) >= 2:
-                        score_text = parts[1].strip()
-                        try:
-                            score = float(score_text.split()[0])
-                            result["matches"].append({"score": score, "details": line})
-                        except:
-                            pass
+            for line in text.strip().split('\n'):
+                score_match = _SCORE_RE.search(line)
+                if score_match:
+                    try:
+                        score = float(score_match.group(1))
+                        result["matches"].append({"score": score, "details": line})
+                    except ValueError:
+                        pass
             
             return result
             
         except Exception as e:
-            logger.error(f"Error parsing matching output: {e}")
+            logger.error("Error parsing matching output: %s", e)
             return {"matches": [], "reasoning": text, "confidence": 0.0}
 
 class LangChainDomainAgent(BaseAgent):
@@ -55,6 +80,9 @@ class LangChainDomainAgent(BaseAgent):
     
     def __init__(self):
         super().__init__("LangChain Domain Alignment Agent")
+        # The RAG pipeline only narrows large alumni lists, so it is loaded on
+        # first use and matching still works without it
+        self._rag_pipeline_failed = False
         self._setup_langchain()
     
     def _setup_langchain(self):
@@ -162,31 +190,35 @@ class LangChainDomainAgent(BaseAgent):
                     "matches": []
                 }
             
+            # Narrow large alumni lists to the closest RAG candidates before scoring
+            candidate_profiles = self._prefilter_alumni(student_profile, alumni_profiles)
+            
             # Prepare input for agent
             agent_input = {
                 "student_profile": json.dumps(student_profile, indent=2),
-                "alumni_profiles": json.dumps(alumni_profiles[:10], indent=2),  # Limit for context
+                "alumni_profiles": json.dumps(candidate_profiles[:10], indent=2),  # Limit for context
                 "tools": "\n".join([f"- {tool.name}: {tool.description}" for tool in self.tools]),
                 "tool_names": [tool.name for tool in self.tools]
             }
             
-            # Execute agent
-            result = self.agent_executor.invoke(agent_input)
+            # Detailed matching only needs the profiles, so run it while the
+            # agent executor waits on the LLM in a worker thread. The LLM task is
+            # scheduled first so its thread is running before scoring starts.
+            llm_task = asyncio.create_task(
+                asyncio.to_thread(self.agent_executor.invoke, agent_input)
+            )
+            detailed_task = asyncio.create_task(
+                self._calculate_detailed_matches(student_profile, candidate_profiles)
+            )
+            
+            result, detailed_matches = await asyncio.gather(llm_task, detailed_task)
             
             # Parse output
             parsed_output = self.output_parser.parse(result["output"])
             
-            # Calculate detailed matches
-            detailed_matches = await self._calculate_detailed_matches(
-                student_profile, alumni_profiles
-            )
-            
-            # Combine results
+            # Combine results (detailed matches are already ordered by compatibility score)
             final_matches = self._combine_results(parsed_output, detailed_matches)
             
-            # Sort by compatibility score
-            final_matches.sort(key=lambda x: x.get("compatibility_score", 0), reverse=True)
-            
             self.log_activity("Completed domain alignment", {
                 "matches_found": len(final_matches),
                 "top_score": final_matches[0].get("compatibility_score", 0) if final_matches else 0
@@ -211,7 +243,7 @@ class LangChainDomainAgent(BaseAgent):
             }
             
         except Exception as e:
-            logger.error(f"Error in LangChain domain alignment: {e}")
+            logger.error("Error in LangChain domain alignment: %s", e)
             self.log_activity("Error in domain alignment", {"error": str(e)})
             return {
                 "success": False,
@@ -219,166 +251,212 @@ class LangChainDomainAgent(BaseAgent):
                 "matches": []
             }
     
+    def _prefilter_alumni(self, student_profile: Dict[str, Any],
+                          alumni_profiles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Restrict alumni to the top RAG candidates for the student"""
+        limit = self.config["RAG_CANDIDATE_LIMIT"]
+        if len(alumni_profiles) <= limit or self._get_rag_pipeline() is None:
+            return alumni_profiles
+        
+        student_query = (
+            f"{', '.join(student_profile.get('target_roles', []))} "
+            f"{', '.join(student_profile.get('skills', []))}"
+        )
+        # The store also keeps profiles from earlier runs, so only search the given ones
+        alumni_ids = [alumni.get("alumni_id") for alumni in alumni_profiles if alumni.get("alumni_id")]
+        candidate_ids = {
+            result.get("metadata", {}).get("alumni_id")
+            for result in self.search_alumni_with_rag(
+                student_query, limit=limit, filters={"alumni_id": alumni_ids})
+        }
+        
+        candidates = [alumni for alumni in alumni_profiles if alumni.get("alumni_id") in candidate_ids]
+        
+        # Vector store may be missing some of the given profiles; score them all then
+        if len(candidates) < limit:
+            return alumni_profiles
+        return candidates
+    
+    def _get_rag_pipeline(self) -> Optional[RAGPipeline]:
+        """Load the RAG pipeline on first use; None if it is unavailable"""
+        if self.rag_pipeline is None and not self._rag_pipeline_failed:
+            rag_pipeline = RAGPipeline()
+            if rag_pipeline.warmup():
+                self.rag_pipeline = rag_pipeline
+            else:
+                logger.warning("RAG pipeline unavailable, matching alumni without prefiltering")
+                self._rag_pipeline_failed = True
+        
+        return self.rag_pipeline
+    
     async def _calculate_detailed_matches(self, student_profile: Dict[str, Any], 
                                         alumni_profiles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Calculate detailed compatibility matches"""
-        matches = []
+        """Calculate detailed compatibility matches, best first"""
+        student_context = self._build_student_context(student_profile)
         
-        student_skills = set(skill.lower() for skill in student_profile.get("skills", []))
-        student_interests = set(interest.lower() for interest in student_profile.get("interests", []))
-        student_targets = set(company.lower() for company in student_profile.get("target_companies", []))
-        student_roles = set(role.lower() for role in student_profile.get("target_roles", []))
+        # Validate once up front so the scoring loop needs no exception handling
+        scored_alumni = [alumni for alumni in alumni_profiles if self._is_valid_alumni(alumni)]
+        skipped = len(alumni_profiles) - len(scored_alumni)
+        if skipped:
+            logger.warning("Skipped %d alumni profiles with malformed fields", skipped)
         
-        for alumni in alumni_profiles:
-            try:
-                # Calculate various compatibility scores
-                skill_score = self._calculate_skill_compatibility(
-                    student_skills, set(skill.lower() for skill in alumni.get("skills", []))
-                )
-                
-                company_score = self._calculate_company_compatibility(
-                    student_targets, alumni.get("current_company", "").lower()
-                )
-                
-                role_score = self._calculate_role_compatibility(
-                    student_roles, alumni.get("current_role", "").lower()
-                )
-                
-                experience_score = self._calculate_experience_compatibility(
-                    student_profile.get("graduation_year", 2024),
-                    alumni.get("years_of_experience", 0)
-                )
-                
-                industry_score = self._calculate_industry_compatibility(
-                    student_interests, alumni.get("industry", "").lower()
-                )
-                
-                # Weighted overall score
-                weights = {
-                    "skill": 0.3,
-                    "company": 0.25,
-                    "role": 0.2,
-                    "experience": 0.15,
-                    "industry": 0.1
-                }
-                
-                overall_score = (
-                    skill_score * weights["skill"] +
-                    company_score * weights["company"] +
-                    role_score * weights["role"] +
-                    experience_score * weights["experience"] +
-                    industry_score * weights["industry"]
-                )
-                
-                # Create match object
-                match = {
-                    "alumni_id": alumni.get("alumni_id"),
-                    "alumni_name": alumni.get("name"),
-                    "current_company": alumni.get("current_company"),
-                    "current_role": alumni.get("current_role"),
-                    "compatibility_score": round(overall_score, 3),
-                    "score_breakdown": {
-                        "skill_compatibility": round(skill_score, 3),
-                        "company_alignment": round(company_score, 3),
-                        "role_relevance": round(role_score, 3),
-                        "experience_level": round(experience_score, 3),
-                        "industry_match": round(industry_score, 3)
-                    },
-                    "matching_skills": list(student_skills.intersection(
-                        set(skill.lower() for skill in alumni.get("skills", []))
-                    )),
-                    "referral_potential": self._assess_referral_potential(alumni),
-                    "contact_feasibility": self._assess_contact_feasibility(alumni)
-                }
-                
-                matches.append(match)
-                
-            except Exception as e:
-                logger.error(f"Error calculating match for alumni {alumni.get('name', 'Unknown')}: {e}")
-                continue
+        if not scored_alumni:
+            return []
+        
+        scores = np.empty((len(scored_alumni), len(MATCH_WEIGHTS)))
+        matching_skills = []
+        
+        for i, alumni in enumerate(scored_alumni):
+            *component_scores, alumni_matching_skills = self._score_all(alumni, student_context)
+            scores[i] = component_scores
+            matching_skills.append(alumni_matching_skills)
+        
+        overall_scores = scores @ MATCH_WEIGHTS
+        
+        # Rank once; every scored alumni is returned, best first
+        order = np.argsort(-overall_scores, kind="stable").tolist()
+        rounded_overall = np.round(overall_scores, 3).tolist()
+        rounded_scores = np.round(scores, 3).tolist()
+        
+        matches = []
+        for i in order:
+            alumni = scored_alumni[i]
+            skill_score, company_score, role_score, experience_score, industry_score = rounded_scores[i]
+            
+            matches.append({
+                "alumni_id": alumni.get("alumni_id"),
+                "alumni_name": alumni.get("name"),
+                "current_company": alumni.get("current_company"),
+                "current_role": alumni.get("current_role"),
+                "compatibility_score": rounded_overall[i],
+                "score_breakdown": {
+                    "skill_compatibility": skill_score,
+                    "company_alignment": company_score,
+                    "role_relevance": role_score,
+                    "experience_level": experience_score,
+                    "industry_match": industry_score
+                },
+                "matching_skills": matching_skills[i],
+                "referral_potential": self._assess_referral_potential(alumni),
+                "contact_feasibility": self._assess_contact_feasibility(alumni)
+            })
         
         return matches
     
-    def _calculate_skill_compatibility(self, student_skills: set, alumni_skills: set) -> float:
-        """Calculate skill compatibility score"""
-        if not student_skills or not alumni_skills:
-            return 0.0
+    def _is_valid_alumni(self, alumni: Any) -> bool:
+        """Check that an alumni profile has the field types used for scoring"""
+        if not isinstance(alumni, dict):
+            return False
         
-        intersection = student_skills.intersection(alumni_skills)
-        union = student_skills.union(alumni_skills)
+        skills = alumni.get("skills", [])
+        if not isinstance(skills, (list, tuple, set)) or not all(isinstance(skill, str) for skill in skills):
+            return False
         
-        return len(intersection) / len(union) if union else 0.0
-    
-    def _calculate_company_compatibility(self, target_companies: set, alumni_company: str) -> float:
-        """Calculate company compatibility score"""
-        if not target_companies or not alumni_company:
-            return 0.5  # Neutral score
+        if not all(isinstance(alumni.get(field, ""), str) for field in ALUMNI_TEXT_FIELDS):
+            return False
         
-        for target in target_companies:
-            if target in alumni_company or alumni_company in target:
-                return 1.0
+        if not all(isinstance(alumni.get(field, 0), (int, float)) for field in ALUMNI_NUMERIC_FIELDS):
+            return False
         
-        return 0.0
+        return isinstance(alumni.get("contact_preferences", {}), dict)
     
-    def _calculate_role_compatibility(self, target_roles: set, alumni_role: str) -> float:
-        """Calculate role compatibility score"""
-        if not target_roles or not alumni_role:
-            return 0.5
-        
-        role_keywords = {
-            "engineer": ["engineer", "developer", "programmer", "architect"],
-            "manager": ["manager", "lead", "director", "head"],
-            "analyst": ["analyst", "researcher", "scientist"],
-            "consultant": ["consultant", "advisor", "strategist"]
-        }
+    def _build_student_context(self, student_profile: Dict[str, Any]) -> Tuple:
+        """Precompute the student-side inputs shared by every alumni score"""
+        student_skills = set(skill.lower() for skill in student_profile.get("skills", []))
+        student_interests = set(interest.lower() for interest in student_profile.get("interests", []))
+        student_targets = set(company.lower() for company in student_profile.get("target_companies", []))
+        student_roles = set(role.lower() for role in student_profile.get("target_roles", []))
         
-        alumni_role_lower = alumni_role.lower()
+        # Keyword groups that contain one of the target roles
+        role_keyword_groups = tuple(
+            keywords for keywords in ROLE_KEYWORDS.values()
+            if not student_roles.isdisjoint(keywords)
+        )
         
-        for target_role in target_roles:
-            # Direct match
-            if target_role in alumni_role_lower:
-                return 1.0
-            
-            # Keyword match
-            for category, keywords in role_keywords.items():
-                if target_role in keywords and any(keyword in alumni_role_lower for keyword in keywords):
-                    return 0.8
+        student_career_stage = max(0, CURRENT_YEAR - student_profile.get("graduation_year", 2024))
         
-        return 0.2
+        return (student_skills, student_targets, student_roles, role_keyword_groups,
+                student_career_stage, self._build_interest_index(student_interests))
     
-    def _calculate_experience_compatibility(self, student_grad_year: int, alumni_experience: int) -> float:
-        """Calculate experience level compatibility"""
-        current_year = 2024
-        student_career_stage = max(0, current_year - student_grad_year)
+    def _score_all(self, alumni: Dict[str, Any], student_context: Tuple) -> Tuple:
+        """Calculate skill, company, role, experience and industry scores in one pass"""
+        (student_skills, student_targets, student_roles, role_keyword_groups,
+         student_career_stage, interest_index) = student_context
+        joined_interests, interest_pattern = interest_index or ("", None)
         
-        # Ideal mentor has 3-10 years more experience
-        experience_gap = alumni_experience - student_career_stage
+        # Skill compatibility (Jaccard)
+        alumni_skills = set(skill.lower() for skill in alumni.get("skills", []))
+        matching_skills = student_skills.intersection(alumni_skills)
+        if student_skills and alumni_skills:
+            skill_score = len(matching_skills) / len(student_skills.union(alumni_skills))
+        else:
+            skill_score = 0.0
         
+        # Company alignment
+        alumni_company = alumni.get("current_company", "").lower()
+        if not student_targets or not alumni_company:
+            company_score = 0.5  # Neutral score
+        elif any(target in alumni_company or alumni_company in target for target in student_targets):
+            company_score = 1.0
+        else:
+            company_score = 0.0
+        
+        # Role relevance
+        alumni_role = alumni.get("current_role", "").lower()
+        if not student_roles or not alumni_role:
+            role_score = 0.5
+        elif any(target_role in alumni_role for target_role in student_roles):
+            role_score = 1.0
+        elif any(keyword in alumni_role for keywords in role_keyword_groups for keyword in keywords):
+            role_score = 0.8
+        else:
+            role_score = 0.2
+        
+        # Experience level - ideal mentor has 3-10 years more experience
+        experience_gap = alumni.get("years_of_experience", 0) - student_career_stage
         if 3 <= experience_gap <= 10:
-            return 1.0
+            experience_score = 1.0
         elif 1 <= experience_gap < 3:
-            return 0.8
+            experience_score = 0.8
         elif 10 < experience_gap <= 15:
-            return 0.7
+            experience_score = 0.7
         elif experience_gap > 15:
-            return 0.5
+            experience_score = 0.5
         else:
-            return 0.3
+            experience_score = 0.3
+        
+        # Industry match
+        alumni_industry = alumni.get("industry", "").lower()
+        industry_keywords = alumni_industry.split()
+        if not interest_index or not alumni_industry:
+            industry_score = 0.5
+        elif not industry_keywords:
+            industry_score = 0.3
+        elif any(keyword in joined_interests for keyword in industry_keywords):
+            industry_score = 1.0
+        elif interest_pattern is not None and interest_pattern.search(alumni_industry):
+            industry_score = 0.8
+        else:
+            industry_score = 0.3
+        
+        return (skill_score, company_score, role_score, experience_score,
+                industry_score, list(matching_skills))
     
-    def _calculate_industry_compatibility(self, student_interests: set, alumni_industry: str) -> float:
-        """Calculate industry compatibility score"""
-        if not student_interests or not alumni_industry:
-            return 0.5
+    def _build_interest_index(self, student_interests: set) -> Optional[Tuple[str, Optional[Pattern]]]:
+        """Precompile student interests once for industry matching"""
+        if not student_interests:
+            return None
         
-        industry_keywords = alumni_industry.lower().split()
+        # Industry keywords never contain whitespace, so a newline-joined string lets
+        # a single substring test cover "keyword in any interest"
+        joined_interests = "\n".join(student_interests)
         
-        for interest in student_interests:
-            if any(keyword in interest for keyword in industry_keywords):
-                return 1.0
-            if any(interest in keyword for keyword in industry_keywords):
-                return 0.8
+        # Only whitespace-free interests can sit inside a single industry keyword
+        single_token = [re.escape(interest) for interest in student_interests
+                        if interest == "".join(interest.split())]
+        interest_pattern = re.compile("|".join(single_token)) if single_token else None
         
-        return 0.3
+        return joined_interests, interest_pattern
     
     def _assess_referral_potential(self, alumni: Dict[str, Any]) -> str:
         """Assess the referral potential of an alumni"""
@@ -1,20 +1,143 @@
-from langgraph.graph import StateGraph, END
+from langgraph.graph import StateGraph, START, END
 from langchain_core.messages import BaseMessage, HumanMessage, AIMessage
-from typing import Dict, Any, List, TypedDict, Annotated
+from typing import Dict, Any, List, TypedDict, Annotated, NamedTuple, Optional
+from collections import defaultdict
+from functools import lru_cache
+from types import MappingProxyType
+import heapq
 import logging
 import json
+import re
+import numpy as np
 from agents.base_agent import BaseAgent
 import operator
 
 logger = logging.getLogger(__name__)
 
+# Seniority titles recognised in alumni roles
+SENIORITY_TITLES = ("director", "vp", "head", "principal", "manager", "lead", "senior")
+EXECUTIVE_TITLES = frozenset({"director", "vp", "head"})
+LEADERSHIP_TITLES = frozenset({"director", "vp", "head", "principal"})
+MANAGEMENT_TITLES = frozenset({"manager", "lead"})
+SENIOR_TITLES = frozenset({"senior", "lead", "manager"})
+
+# Single alternation so each role is scanned once for every title
+ROLE_TITLE_PATTERN = re.compile("|".join(SENIORITY_TITLES))
+
+@lru_cache(maxsize=1024)
+def role_titles(role: str) -> frozenset:
+    """Seniority titles contained in a role, computed once per distinct role"""
+    return frozenset(ROLE_TITLE_PATTERN.findall(role.lower()))
+
+class AlumniSignals(NamedTuple):
+    """Alumni fields read by the path evaluators, extracted once per profile"""
+    years_of_experience: int
+    role_titles: frozenset
+    has_linkedin: bool
+    has_email: bool
+    willing_to_refer: bool
+    referral_count: int
+    max_referrals: int
+    
+    @classmethod
+    def from_alumni(cls, alumni: Dict[str, Any]) -> "AlumniSignals":
+        return cls(
+            years_of_experience=alumni.get("years_of_experience", 0),
+            role_titles=role_titles(alumni.get("current_role", "")),
+            has_linkedin=bool(alumni.get("linkedin_url")),
+            has_email=bool(alumni.get("email")),
+            willing_to_refer=alumni.get("willing_to_refer", True),
+            referral_count=alumni.get("referral_count_this_month", 0),
+            max_referrals=alumni.get("max_referrals_per_month", 3)
+        )
+
+# Response time buckets, fastest first
+RESPONSE_FAST, RESPONSE_MODERATE, RESPONSE_SLOW, RESPONSE_UNKNOWN = range(4)
+
+@lru_cache(maxsize=256)
+def response_time_bucket(response_time: str) -> int:
+    """Classify an estimated response time string once per distinct value"""
+    if "1-3" in response_time:
+        return RESPONSE_FAST
+    elif "2-5" in response_time:
+        return RESPONSE_MODERATE
+    elif "3-7" in response_time:
+        return RESPONSE_SLOW
+    return RESPONSE_UNKNOWN
+
+# Risk flags for a referral path, in reporting order
+RISK_UNWILLING, RISK_REFERRAL_LIMIT, RISK_LIMITED_CONTACT, RISK_INTERMEDIARY, RISK_LOW_PROBABILITY = (
+    1 << bit for bit in range(5)
+)
+RISK_MESSAGES = (
+    (RISK_UNWILLING, "Alumni may not be willing to provide referrals"),
+    (RISK_REFERRAL_LIMIT, "Alumni has reached referral limit for this month"),
+    (RISK_LIMITED_CONTACT, "Limited contact information available"),
+    (RISK_INTERMEDIARY, "Depends on intermediary's willingness to help"),
+    (RISK_LOW_PROBABILITY, "Lower probability of successful referral"),
+)
+
+# Maximum recommendations kept per path type (other types keep one)
+MAX_PATHS_PER_TYPE = {
+    "direct": 3,
+    "company_network": 2,
+    "mutual_connection": 2,
+    "skill_based": 1
+}
+
+# Shared, read-only parts of every finalized recommendation. They are immutable
+# and copied into each result, so a caller editing one result can't change the rest.
+PREPARATION_REQUIRED = (
+    "Research company and role requirements",
+    "Prepare elevator pitch",
+    "Update resume if needed"
+)
+
+REFERRAL_TIMELINE = MappingProxyType({
+    "day_1": "Research and prepare outreach",
+    "day_2-3": "Send initial contact",
+    "day_7-10": "Follow up if needed",
+    "day_14-21": "Referral conversation/interview",
+    "day_21-28": "Submit application with referral"
+})
+
+SUCCESS_METRICS = MappingProxyType({
+    "response_rate": "Alumni responds within 7 days",
+    "engagement": "Positive response to referral request",
+    "referral_provided": "Alumni agrees to provide referral",
+    "application_success": "Application moves to interview stage",
+    "relationship_building": "Ongoing professional relationship established"
+})
+
+BACKUP_ALTERNATIVE_CONTACT = MappingProxyType({
+    "type": "alternative_contact",
+    "description": "Try different contact method (LinkedIn vs email)",
+    "trigger": "No response after 7 days"
+})
+
+BACKUP_ALTERNATIVE_ALUMNI = MappingProxyType({
+    "type": "alternative_alumni",
+    "description": "Contact alternative alumni at same company",
+    "trigger": "Primary contact declines or doesn't respond"
+})
+
+BACKUP_DIFFERENT_APPROACH = MappingProxyType({
+    "type": "different_approach",
+    "description": "Try informational interview approach instead of direct referral request",
+    "trigger": "Referral request is declined"
+})
+
+def merge_analysis(left: Dict[str, Any], right: Dict[str, Any]) -> Dict[str, Any]:
+    """Merge connection analysis results written by parallel nodes"""
+    return {**left, **right}
+
 class ReferralState(TypedDict):
     """State for referral path recommendation"""
     messages: Annotated[List[BaseMessage], operator.add]
     student_profile: Dict[str, Any]
     matched_alumni: List[Dict[str, Any]]
     referral_paths: List[Dict[str, Any]]
-    current_analysis: Dict[str, Any]
+    current_analysis: Annotated[Dict[str, Any], merge_analysis]
     recommendations: List[Dict[str, Any]]
     next_action: str
 
@@ -32,22 +155,25 @@ class LangGraphReferralAgent(BaseAgent):
         workflow = StateGraph(ReferralState)
         
         # Add nodes
-        workflow.add_node("analyze_connections", self._analyze_connections)
+        workflow.add_node("analyze_direct", self._analyze_direct_connections)
+        workflow.add_node("analyze_mutual", self._analyze_mutual_connections)
         workflow.add_node("build_paths", self._build_referral_paths)
         workflow.add_node("evaluate_paths", self._evaluate_paths)
         workflow.add_node("optimize_recommendations", self._optimize_recommendations)
         workflow.add_node("finalize_paths", self._finalize_paths)
         
+        # Per-alumni and pairwise connection analysis are independent, so fan out
+        # and join both branches before building paths
+        workflow.add_edge(START, "analyze_direct")
+        workflow.add_edge(START, "analyze_mutual")
+        workflow.add_edge(["analyze_direct", "analyze_mutual"], "build_paths")
+        
         # Add edges
-        workflow.add_edge("analyze_connections", "build_paths")
         workflow.add_edge("build_paths", "evaluate_paths")
         workflow.add_edge("evaluate_paths", "optimize_recommendations")
         workflow.add_edge("optimize_recommendations", "finalize_paths")
         workflow.add_edge("finalize_paths", END)
         
-        # Set entry point
-        workflow.set_entry_point("analyze_connections")
-        
         # Compile the graph
         self.app = workflow.compile()
     
@@ -64,7 +190,7 @@ class LangGraphReferralAgent(BaseAgent):
                 referral_paths=[],
                 current_analysis={},
                 recommendations=[],
-                next_action="analyze_connections"
+                next_action="analyze_direct"
             )
             
             # Execute the workflow
@@ -170,60 +296,72 @@ class LangGraphReferralAgent(BaseAgent):
             logger.error(f"Error generating fallback recommendations: {e}")
             return []
     
-    def _analyze_connections(self, state: ReferralState) -> ReferralState:
-        """Analyze potential connections and relationships"""
+    def _analyze_direct_connections(self, state: ReferralState) -> Dict[str, Any]:
+        """Analyze direct, company and skill connections for each alumni"""
         try:
             student_profile = state["student_profile"]
             matched_alumni = state["matched_alumni"]
             
-            connection_analysis = {
-                "direct_connections": [],
-                "mutual_connections": [],
-                "company_networks": {},
-                "skill_overlaps": {},
-                "geographic_proximity": {}
-            }
+            student_skills = frozenset(student_profile.get("skills", []))
+            
+            # Direct connection strength for all alumni in one vectorized pass
+            direct_scores = self._calculate_direct_connection_strengths(student_profile, matched_alumni)
             
-            # Analyze each alumni connection
+            # Direct connection analysis
+            direct_connections = [
+                {
+                    "alumni_id": alumni.get("alumni_id"),
+                    "strength": direct_score,
+                    "connection_type": "direct"
+                }
+                for alumni, direct_score in zip(matched_alumni, direct_scores.tolist())
+                if direct_score > 0.5
+            ]
+            
+            # Company network analysis
+            company_networks = defaultdict(list)
             for alumni in matched_alumni:
-                alumni_id = alumni.get("alumni_id")
-                
-                # Direct connection analysis
-                direct_score = self._calculate_direct_connection_strength(student_profile, alumni)
-                if direct_score > 0.5:
-                    connection_analysis["direct_connections"].append({
-                        "alumni_id": alumni_id,
-                        "strength": direct_score,
-                        "connection_type": "direct"
-                    })
-                
-                # Company network analysis
                 company = alumni.get("current_company", "")
                 if company:
-                    if company not in connection_analysis["company_networks"]:
-                        connection_analysis["company_networks"][company] = []
-                    connection_analysis["company_networks"][company].append(alumni_id)
-                
-                # Skill overlap analysis
-                student_skills = set(student_profile.get("skills", []))
-                alumni_skills = set(alumni.get("skills", []))
-                overlap = student_skills.intersection(alumni_skills)
-                if overlap:
-                    connection_analysis["skill_overlaps"][alumni_id] = list(overlap)
+                    company_networks[company].append(alumni.get("alumni_id"))
             
-            # Find mutual connections (alumni who know each other)
-            connection_analysis["mutual_connections"] = self._find_mutual_connections(matched_alumni)
+            # Skill overlap analysis
+            skill_overlaps = {
+                alumni.get("alumni_id"): list(overlap)
+                for alumni in matched_alumni
+                if (overlap := student_skills.intersection(alumni.get("skills", [])))
+            }
             
-            # Update state
-            state["current_analysis"] = connection_analysis
-            state["messages"].append(AIMessage(content="Connection analysis completed"))
+            connection_analysis = {
+                "direct_connections": direct_connections,
+                "company_networks": dict(company_networks),
+                "skill_overlaps": skill_overlaps,
+                "geographic_proximity": {}
+            }
             
-            return state
+            # Parallel branches return only the keys they update
+            return {
+                "current_analysis": connection_analysis,
+                "messages": [AIMessage(content="Direct connection analysis completed")]
+            }
             
         except Exception as e:
-            logger.error(f"Error in analyze_connections: {e}")
-            state["messages"].append(AIMessage(content=f"Error in connection analysis: {str(e)}"))
-            return state
+            logger.error(f"Error in analyze_direct: {e}")
+            return {"messages": [AIMessage(content=f"Error in direct connection analysis: {str(e)}")]}
+    
+    def _analyze_mutual_connections(self, state: ReferralState) -> Dict[str, Any]:
+        """Find alumni who might know each other"""
+        try:
+            return {
+                "current_analysis": {
+                    "mutual_connections": self._find_mutual_connections(state["matched_alumni"])
+                },
+                "messages": [AIMessage(content="Mutual connection analysis completed")]
+            }
+            
+        except Exception as e:
+            logger.error(f"Error in analyze_mutual: {e}")
+            return {"messages": [AIMessage(content=f"Error in mutual connection analysis: {str(e)}")]}
     
     def _build_referral_paths(self, state: ReferralState) -> ReferralState:
         """Build potential referral paths"""
@@ -234,10 +372,16 @@ class LangGraphReferralAgent(BaseAgent):
             
             referral_paths = []
             
+            # Index alumni once for O(1) lookups (first occurrence wins on duplicate IDs)
+            alumni_by_id = {a.get("alumni_id"): a for a in reversed(matched_alumni)}
+            
+            # Estimate each alumni's response time once; alumni appear in several paths
+            response_times = {id(a): self._estimate_response_time(a) for a in matched_alumni}
+            
             # Build direct paths
             for connection in connection_analysis.get("direct_connections", []):
                 alumni_id = connection["alumni_id"]
-                alumni = next((a for a in matched_alumni if a.get("alumni_id") == alumni_id), None)
+                alumni = alumni_by_id.get(alumni_id)
                 
                 if alumni:
                     path = {
@@ -246,40 +390,47 @@ class LangGraphReferralAgent(BaseAgent):
                         "path": [student_profile.get("student_id"), alumni_id],
                         "alumni_details": [alumni],
                         "connection_strength": connection["strength"],
-                        "estimated_response_time": self._estimate_response_time(alumni),
+                        "estimated_response_time": response_times[id(alumni)],
                         "success_probability": self._calculate_success_probability(alumni, "direct"),
                         "path_description": f"Direct contact with {alumni.get('name')} at {alumni.get('current_company')}"
                     }
                     referral_paths.append(path)
             
-            # Build company-based paths
-            for company, alumni_ids in connection_analysis.get("company_networks", {}).items():
-                if len(alumni_ids) > 1:
-                    # Multi-alumni company paths
-                    company_alumni = [a for a in matched_alumni if a.get("alumni_id") in alumni_ids]
-                    
-                    # Sort by seniority/influence
-                    company_alumni.sort(key=lambda x: x.get("years_of_experience", 0), reverse=True)
-                    
-                    for i, primary_alumni in enumerate(company_alumni[:3]):  # Top 3
-                        path = {
-                            "path_id": f"company_{company}_{i}",
-                            "type": "company_network",
-                            "path": [student_profile.get("student_id"), primary_alumni.get("alumni_id")],
-                            "alumni_details": [primary_alumni],
-                            "company": company,
-                            "alternative_contacts": company_alumni[i+1:i+3],  # Next 2 as alternatives
-                            "connection_strength": 0.7,  # Company-based connections are generally strong
-                            "estimated_response_time": self._estimate_response_time(primary_alumni),
-                            "success_probability": self._calculate_success_probability(primary_alumni, "company"),
-                            "path_description": f"Contact {primary_alumni.get('name')} (senior contact) at {company}"
-                        }
-                        referral_paths.append(path)
+            # Build company-based paths for companies with multiple alumni
+            company_groups = {
+                company: []
+                for company, alumni_ids in connection_analysis.get("company_networks", {}).items()
+                if len(alumni_ids) > 1
+            }
+            
+            # Sort by seniority/influence once; grouping keeps that order within each company
+            for alumni in sorted(
+                (a for a in matched_alumni if a.get("current_company", "") in company_groups),
+                key=lambda x: x.get("years_of_experience", 0),
+                reverse=True
+            ):
+                company_groups[alumni.get("current_company", "")].append(alumni)
+            
+            for company, company_alumni in company_groups.items():
+                for i, primary_alumni in enumerate(company_alumni[:3]):  # Top 3
+                    path = {
+                        "path_id": f"company_{company}_{i}",
+                        "type": "company_network",
+                        "path": [student_profile.get("student_id"), primary_alumni.get("alumni_id")],
+                        "alumni_details": [primary_alumni],
+                        "company": company,
+                        "alternative_contacts": company_alumni[i+1:i+3],  # Next 2 as alternatives
+                        "connection_strength": 0.7,  # Company-based connections are generally strong
+                        "estimated_response_time": response_times[id(primary_alumni)],
+                        "success_probability": self._calculate_success_probability(primary_alumni, "company"),
+                        "path_description": f"Contact {primary_alumni.get('name')} (senior contact) at {company}"
+                    }
+                    referral_paths.append(path)
             
             # Build mutual connection paths
             for mutual_pair in connection_analysis.get("mutual_connections", []):
-                alumni_1 = next((a for a in matched_alumni if a.get("alumni_id") == mutual_pair[0]), None)
-                alumni_2 = next((a for a in matched_alumni if a.get("alumni_id") == mutual_pair[1]), None)
+                alumni_1 = alumni_by_id.get(mutual_pair[0])
+                alumni_2 = alumni_by_id.get(mutual_pair[1])
                 
                 if alumni_1 and alumni_2:
                     # Choose the better intermediary
@@ -294,7 +445,7 @@ class LangGraphReferralAgent(BaseAgent):
                         "intermediary": intermediary,
                         "target": target,
                         "connection_strength": 0.8,  # Mutual connections are strong
-                        "estimated_response_time": self._estimate_response_time(intermediary) + " + 1-2 days",
+                        "estimated_response_time": response_times[id(intermediary)] + " + 1-2 days",
                         "success_probability": self._calculate_success_probability(target, "mutual"),
                         "path_description": f"Contact {target.get('name')} at {target.get('current_company')} through {intermediary.get('name')}"
                     }
@@ -303,7 +454,7 @@ class LangGraphReferralAgent(BaseAgent):
             # Build skill-based paths
             for alumni_id, shared_skills in connection_analysis.get("skill_overlaps", {}).items():
                 if len(shared_skills) >= 3:  # Strong skill overlap
-                    alumni = next((a for a in matched_alumni if a.get("alumni_id") == alumni_id), None)
+                    alumni = alumni_by_id.get(alumni_id)
                     
                     if alumni:
                         path = {
@@ -313,7 +464,7 @@ class LangGraphReferralAgent(BaseAgent):
                             "alumni_details": [alumni],
                             "shared_skills": shared_skills,
                             "connection_strength": 0.6 + (len(shared_skills) * 0.1),
-                            "estimated_response_time": self._estimate_response_time(alumni),
+                            "estimated_response_time": response_times[id(alumni)],
                             "success_probability": self._calculate_success_probability(alumni, "skill"),
                             "path_description": f"Connect with {alumni.get('name')} based on shared expertise in {', '.join(shared_skills[:3])}"
                         }
@@ -334,28 +485,31 @@ class LangGraphReferralAgent(BaseAgent):
         try:
             referral_paths = state["referral_paths"]
             
-            for path in referral_paths:
-                # Calculate comprehensive path score
-                score = self._calculate_path_score(path)
+            # Read each alumni profile once; paths share the same alumni dicts
+            signals = {id(a): AlumniSignals.from_alumni(a) for a in state["matched_alumni"]}
+            
+            # Calculate comprehensive path scores for all paths at once
+            path_scores = self._calculate_path_scores(referral_paths, signals)
+            
+            for path, score in zip(referral_paths, path_scores.tolist()):
                 path["score"] = score
+            
+            # Sort paths by score
+            referral_paths.sort(key=lambda x: x.get("score", 0), reverse=True)
+            
+            # Only the paths that can become recommendations need full evaluation
+            for path in self._select_top_paths(referral_paths):
+                alumni = self._lead_alumni_signals(path, signals)
                 
                 # Add evaluation metrics
-                path["evaluation"] = {
-                    "accessibility": self._evaluate_accessibility(path),
-                    "influence": self._evaluate_influence(path),
-                    "responsiveness": self._evaluate_responsiveness(path),
-                    "relevance": self._evaluate_relevance(path),
-                    "timing": self._evaluate_timing(path)
-                }
+                path["evaluation"] = self._evaluate_path_metrics(path, alumni)
                 
                 # Calculate risk factors
-                path["risk_factors"] = self._identify_risk_factors(path)
+                risk_flags = self._identify_risk_flags(path, alumni)
+                path["risk_factors"] = self._describe_risk_factors(risk_flags)
                 
                 # Generate path optimization suggestions
-                path["optimization_suggestions"] = self._generate_optimization_suggestions(path)
-            
-            # Sort paths by score
-            referral_paths.sort(key=lambda x: x.get("score", 0), reverse=True)
+                path["optimization_suggestions"] = self._generate_optimization_suggestions(path, risk_flags)
             
             state["referral_paths"] = referral_paths
             state["messages"].append(AIMessage(content="Path evaluation completed"))
@@ -376,34 +530,21 @@ class LangGraphReferralAgent(BaseAgent):
             # Filter and optimize paths
             optimized_recommendations = []
             
-            # Group paths by type for balanced recommendations
-            path_groups = {}
-            for path in referral_paths:
-                path_type = path.get("type", "unknown")
-                if path_type not in path_groups:
-                    path_groups[path_type] = []
-                path_groups[path_type].append(path)
-            
-            # Select best paths from each type
-            max_per_type = {
-                "direct": 3,
-                "company_network": 2,
-                "mutual_connection": 2,
-                "skill_based": 1
-            }
+            # Student-side sets shared by every personalized path
+            target_companies = frozenset(student_profile.get("target_companies", []))
+            student_skills = frozenset(student_profile.get("skills", []))
             
-            for path_type, paths in path_groups.items():
-                limit = max_per_type.get(path_type, 1)
-                top_paths = sorted(paths, key=lambda x: x.get("score", 0), reverse=True)[:limit]
-                
-                for path in top_paths:
-                    # Enhance path with optimization
-                    optimized_path = self._optimize_individual_path(path, student_profile)
-                    optimized_recommendations.append(optimized_path)
+            for path in self._select_top_paths(referral_paths):
+                # Enhance path with optimization
+                optimized_path = self._optimize_individual_path(
+                    path, student_profile, target_companies, student_skills
+                )
+                optimized_recommendations.append(optimized_path)
             
-            # Final sorting and limiting
-            optimized_recommendations.sort(key=lambda x: x.get("score", 0), reverse=True)
-            final_recommendations = optimized_recommendations[:8]  # Top 8 recommendations
+            # Final selection of top 8 recommendations (stable, like sort + slice)
+            final_recommendations = heapq.nlargest(
+                8, optimized_recommendations, key=lambda x: x.get("score", 0)
+            )
             
             # Add recommendation metadata
             for i, rec in enumerate(final_recommendations):
@@ -446,46 +587,70 @@ class LangGraphReferralAgent(BaseAgent):
             return state
     
     # Helper methods
-    def _calculate_direct_connection_strength(self, student: Dict[str, Any], alumni: Dict[str, Any]) -> float:
-        """Calculate strength of direct connection"""
-        score = 0.0
-        
-        # Same graduation year bonus
-        if abs(student.get("graduation_year", 2024) - alumni.get("graduation_year", 2020)) <= 2:
-            score += 0.3
-        
-        # Same degree/major bonus
-        if student.get("major", "").lower() == alumni.get("major", "").lower():
-            score += 0.2
-        
-        # Skill overlap
+    def _select_top_paths(self, referral_paths: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Select the best scored paths from each type for balanced recommendations"""
+        # Group paths by type
+        path_groups = defaultdict(list)
+        for path in referral_paths:
+            path_groups[path.get("type", "unknown")].append(path)
+        
+        top_paths = []
+        for path_type, paths in path_groups.items():
+            limit = MAX_PATHS_PER_TYPE.get(path_type, 1)
+            top_paths.extend(heapq.nlargest(limit, paths, key=lambda x: x.get("score", 0)))
+        
+        return top_paths
+    
+    def _calculate_direct_connection_strengths(self, student: Dict[str, Any],
+                                               alumni_list: List[Dict[str, Any]]) -> np.ndarray:
+        """Calculate strength of direct connection for each alumni"""
+        student_year = student.get("graduation_year", 2024)
+        student_major = student.get("major", "").lower()
         student_skills = set(student.get("skills", []))
-        alumni_skills = set(alumni.get("skills", []))
-        skill_overlap = len(student_skills.intersection(alumni_skills))
-        score += min(skill_overlap * 0.1, 0.3)
         
-        # LinkedIn connection (if available)
-        if alumni.get("linkedin_url"):
-            score += 0.2
+        graduation_years = np.array([alumni.get("graduation_year", 2020) for alumni in alumni_list])
+        same_major = np.array([alumni.get("major", "").lower() == student_major for alumni in alumni_list], dtype=bool)
+        skill_overlap = np.array([len(student_skills.intersection(alumni.get("skills", []))) for alumni in alumni_list])
+        has_linkedin = np.array([bool(alumni.get("linkedin_url")) for alumni in alumni_list], dtype=bool)
         
-        return min(score, 1.0)
+        score = (
+            0.3 * (np.abs(student_year - graduation_years) <= 2) +  # Same graduation year bonus
+            0.2 * same_major +                                       # Same degree/major bonus
+            np.minimum(skill_overlap * 0.1, 0.3) +                   # Skill overlap
+            0.2 * has_linkedin                                       # LinkedIn connection (if available)
+        )
+        
+        return np.minimum(score, 1.0)
     
     def _find_mutual_connections(self, alumni_list: List[Dict[str, Any]]) -> List[tuple]:
         """Find alumni who might know each other"""
-        mutual_connections = []
+        if len(alumni_list) < 2:
+            return []
         
-        for i in range(len(alumni_list)):
-            for j in range(i + 1, len(alumni_list)):
-                alumni_1 = alumni_list[i]
-                alumni_2 = alumni_list[j]
-                
-                # Same company (current or previous)
-                if alumni_1.get("current_company") == alumni_2.get("current_company"):
-                    mutual_connections.append((alumni_1.get("alumni_id"), alumni_2.get("alumni_id")))
-                
-                # Similar graduation years
-                if abs(alumni_1.get("graduation_year", 0) - alumni_2.get("graduation_year", 0)) <= 2:
-                    mutual_connections.append((alumni_1.get("alumni_id"), alumni_2.get("alumni_id")))
+        alumni_ids = [alumni.get("alumni_id") for alumni in alumni_list]
+        
+        # Encode companies as integer codes so the pairwise comparison runs in NumPy
+        company_codes = {}
+        companies = np.array([
+            company_codes.setdefault(alumni.get("current_company"), len(company_codes))
+            for alumni in alumni_list
+        ])
+        years = np.array([alumni.get("graduation_year", 0) for alumni in alumni_list])
+        
+        # Same company (current or previous) or similar graduation years
+        related = (companies[:, None] == companies[None, :]) | (np.abs(years[:, None] - years[None, :]) <= 2)
+        
+        # Each unordered pair of positions once
+        rows, cols = np.nonzero(np.triu(related, k=1))
+        
+        # Duplicate profiles can still repeat an ID pair or pair an alumni with itself
+        mutual_connections = []
+        seen_pairs = set()
+        for i, j in zip(rows.tolist(), cols.tolist()):
+            pair = frozenset((alumni_ids[i], alumni_ids[j]))
+            if len(pair) == 2 and pair not in seen_pairs:
+                seen_pairs.add(pair)
+                mutual_connections.append((alumni_ids[i], alumni_ids[j]))
         
         return mutual_connections
     
@@ -498,10 +663,10 @@ class LangGraphReferralAgent(BaseAgent):
             return response_time
         
         # Estimate based on role seniority
-        role = alumni.get("current_role", "").lower()
-        if "director" in role or "vp" in role or "head" in role:
+        titles = role_titles(alumni.get("current_role", ""))
+        if titles & EXECUTIVE_TITLES:
             return "3-7 days"
-        elif "manager" in role or "lead" in role:
+        elif titles & MANAGEMENT_TITLES:
             return "2-5 days"
         else:
             return "1-3 days"
@@ -529,161 +694,161 @@ class LangGraphReferralAgent(BaseAgent):
         
         return min(base_probability, 1.0)
     
-    def _calculate_path_score(self, path: Dict[str, Any]) -> float:
-        """Calculate overall score for a referral path"""
-        weights = {
-            "connection_strength": 0.25,
-            "success_probability": 0.25,
-            "response_likelihood": 0.20,
-            "influence_factor": 0.15,
-            "accessibility": 0.15
-        }
+    def _lead_alumni_signals(self, path: Dict[str, Any],
+                             signals: Dict[int, AlumniSignals]) -> Optional[AlumniSignals]:
+        """Signals for the first alumni on a path, if any"""
+        alumni_details = path.get("alumni_details", [])
+        if not alumni_details:
+            return None
         
+        alumni = alumni_details[0]
+        alumni_signals = signals.get(id(alumni))
+        return alumni_signals if alumni_signals is not None else AlumniSignals.from_alumni(alumni)
+    
+    def _calculate_path_factors(self, path: Dict[str, Any], alumni: Optional[AlumniSignals]) -> tuple:
+        """Extract the factors that make up a referral path score"""
         connection_strength = path.get("connection_strength", 0.5)
         success_probability = path.get("success_probability", 0.5)
         
         # Calculate response likelihood
         response_time = path.get("estimated_response_time", "3-5 days")
-        response_likelihood = 0.8 if "1-3" in response_time else 0.6
+        response_likelihood = 0.8 if response_time_bucket(response_time) == RESPONSE_FAST else 0.6
         
         # Calculate influence factor
-        alumni_details = path.get("alumni_details", [])
         influence_factor = 0.5
-        if alumni_details:
-            alumni = alumni_details[0]
-            years_exp = alumni.get("years_of_experience", 0)
-            role = alumni.get("current_role", "").lower()
+        if alumni is not None:
+            years_exp = alumni.years_of_experience
+            titles = alumni.role_titles
             
-            if years_exp >= 10 or any(title in role for title in ["director", "vp", "head", "principal"]):
+            if years_exp >= 10 or titles & LEADERSHIP_TITLES:
                 influence_factor = 0.9
-            elif years_exp >= 5 or "manager" in role or "lead" in role:
+            elif years_exp >= 5 or titles & MANAGEMENT_TITLES:
                 influence_factor = 0.7
         
         # Calculate accessibility
         accessibility = 0.8 if path.get("type") == "direct" else 0.6
         
-        # Weighted score
-        score = (
-            connection_strength * weights["connection_strength"] +
-            success_probability * weights["success_probability"] +
-            response_likelihood * weights["response_likelihood"] +
-            influence_factor * weights["influence_factor"] +
-            accessibility * weights["accessibility"]
+        return connection_strength, success_probability, response_likelihood, influence_factor, accessibility
+    
+    def _calculate_path_scores(self, paths: List[Dict[str, Any]],
+                               signals: Dict[int, AlumniSignals]) -> np.ndarray:
+        """Calculate overall scores for referral paths"""
+        factors = np.array([
+            self._calculate_path_factors(path, self._lead_alumni_signals(path, signals))
+            for path in paths
+        ], dtype=float).reshape(-1, 5)
+        
+        # Weighted score: connection strength, success probability, response likelihood,
+        # influence factor and accessibility
+        scores = (
+            factors[:, 0] * 0.25 +
+            factors[:, 1] * 0.25 +
+            factors[:, 2] * 0.20 +
+            factors[:, 3] * 0.15 +
+            factors[:, 4] * 0.15
         )
         
-        return round(score, 3)
+        return np.round(scores, 3)
     
-    def _evaluate_accessibility(self, path: Dict[str, Any]) -> float:
-        """Evaluate how accessible the alumni is"""
-        alumni_details = path.get("alumni_details", [])
-        if not alumni_details:
-            return 0.5
-        
-        alumni = alumni_details[0]
-        score = 0.5
+    def _evaluate_path_metrics(self, path: Dict[str, Any], alumni: Optional[AlumniSignals]) -> Dict[str, float]:
+        """Evaluate accessibility, influence, responsiveness, relevance and timing in one pass"""
+        # Responsiveness depends only on the estimated response time
+        responsiveness = (0.9, 0.7, 0.6, 0.5)[
+            response_time_bucket(path.get("estimated_response_time", "unknown"))
+        ]
         
-        if alumni.get("linkedin_url"):
-            score += 0.2
-        if alumni.get("email"):
-            score += 0.2
-        if alumni.get("willing_to_refer", True):
-            score += 0.1
-        
-        return min(score, 1.0)
-    
-    def _evaluate_influence(self, path: Dict[str, Any]) -> float:
-        """Evaluate the influence level of alumni"""
-        alumni_details = path.get("alumni_details", [])
-        if not alumni_details:
-            return 0.5
+        # Relevance to student's goals - would be enhanced with more context about student goals
+        shared_skills = path.get("shared_skills", [])
+        relevance = min(0.5 + len(shared_skills) * 0.1, 1.0) if shared_skills else 0.6
         
-        alumni = alumni_details[0]
-        years_exp = alumni.get("years_of_experience", 0)
-        role = alumni.get("current_role", "").lower()
+        if alumni is None:
+            return {
+                "accessibility": 0.5,
+                "influence": 0.5,
+                "responsiveness": responsiveness,
+                "relevance": relevance,
+                "timing": 0.5
+            }
         
-        if years_exp >= 15 or any(title in role for title in ["vp", "director", "head", "principal"]):
-            return 0.9
-        elif years_exp >= 10 or any(title in role for title in ["senior", "lead", "manager"]):
-            return 0.7
+        # How accessible the alumni is
+        accessibility = 0.5
+        if alumni.has_linkedin:
+            accessibility += 0.2
+        if alumni.has_email:
+            accessibility += 0.2
+        if alumni.willing_to_refer:
+            accessibility += 0.1
+        accessibility = min(accessibility, 1.0)
+        
+        # Influence level of alumni
+        years_exp = alumni.years_of_experience
+        titles = alumni.role_titles
+        if years_exp >= 15 or titles & LEADERSHIP_TITLES:
+            influence = 0.9
+        elif years_exp >= 10 or titles & SENIOR_TITLES:
+            influence = 0.7
         elif years_exp >= 5:
-            return 0.6
-        else:
-            return 0.4
-    
-    def _evaluate_responsiveness(self, path: Dict[str, Any]) -> float:
-        """Evaluate likely responsiveness"""
-        response_time = path.get("estimated_response_time", "unknown")
-        
-        if "1-3" in response_time:
-            return 0.9
-        elif "2-5" in response_time:
-            return 0.7
-        elif "3-7" in response_time:
-            return 0.6
+            influence = 0.6
         else:
-            return 0.5
-    
-    def _evaluate_relevance(self, path: Dict[str, Any]) -> float:
-        """Evaluate relevance to student's goals"""
-        # This would be enhanced with more context about student goals
-        shared_skills = path.get("shared_skills", [])
-        if shared_skills:
-            return min(0.5 + len(shared_skills) * 0.1, 1.0)
-        return 0.6
-    
-    def _evaluate_timing(self, path: Dict[str, Any]) -> float:
-        """Evaluate timing appropriateness"""
-        # Current month referral capacity
-        alumni_details = path.get("alumni_details", [])
-        if not alumni_details:
-            return 0.5
-        
-        alumni = alumni_details[0]
-        current_referrals = alumni.get("referral_count_this_month", 0)
-        max_referrals = alumni.get("max_referrals_per_month", 3)
+            influence = 0.4
         
+        # Timing - current month referral capacity
+        current_referrals = alumni.referral_count
+        max_referrals = alumni.max_referrals
         if current_referrals == 0:
-            return 1.0
+            timing = 1.0
         elif current_referrals < max_referrals / 2:
-            return 0.8
+            timing = 0.8
         elif current_referrals < max_referrals:
-            return 0.6
+            timing = 0.6
         else:
-            return 0.2
+            timing = 0.2
+        
+        return {
+            "accessibility": accessibility,
+            "influence": influence,
+            "responsiveness": responsiveness,
+            "relevance": relevance,
+            "timing": timing
+        }
     
-    def _identify_risk_factors(self, path: Dict[str, Any]) -> List[str]:
-        """Identify potential risk factors"""
-        risks = []
+    def _identify_risk_flags(self, path: Dict[str, Any], alumni: Optional[AlumniSignals]) -> int:
+        """Identify potential risk factors as a bitmask of RISK_* flags"""
+        flags = 0
         
-        alumni_details = path.get("alumni_details", [])
-        if alumni_details:
-            alumni = alumni_details[0]
-            
-            if not alumni.get("willing_to_refer", True):
-                risks.append("Alumni may not be willing to provide referrals")
+        if alumni is not None:
+            if not alumni.willing_to_refer:
+                flags |= RISK_UNWILLING
             
-            if alumni.get("referral_count_this_month", 0) >= alumni.get("max_referrals_per_month", 3):
-                risks.append("Alumni has reached referral limit for this month")
+            if alumni.referral_count >= alumni.max_referrals:
+                flags |= RISK_REFERRAL_LIMIT
             
-            if not alumni.get("linkedin_url") and not alumni.get("email"):
-                risks.append("Limited contact information available")
+            if not (alumni.has_linkedin or alumni.has_email):
+                flags |= RISK_LIMITED_CONTACT
         
         if path.get("type") == "mutual_connection":
-            risks.append("Depends on intermediary's willingness to help")
+            flags |= RISK_INTERMEDIARY
         
         if path.get("success_probability", 0) < 0.5:
-            risks.append("Lower probability of successful referral")
+            flags |= RISK_LOW_PROBABILITY
         
-        return risks
+        return flags
     
-    def _generate_optimization_suggestions(self, path: Dict[str, Any]) -> List[str]:
+    def _describe_risk_factors(self, risk_flags: int) -> List[str]:
+        """Describe the risk factors set in a bitmask"""
+        if not risk_flags:
+            return []
+        
+        return [message for flag, message in RISK_MESSAGES if risk_flags & flag]
+    
+    def _generate_optimization_suggestions(self, path: Dict[str, Any], risk_flags: int) -> List[str]:
         """Generate suggestions to optimize the path"""
         suggestions = []
         
         if path.get("connection_strength", 0) < 0.6:
             suggestions.append("Research common connections or shared interests before reaching out")
         
-        if "Limited contact information" in path.get("risk_factors", []):
+        if risk_flags & RISK_LIMITED_CONTACT:
             suggestions.append("Try to find mutual connections who can provide better contact details")
         
         if path.get("type") == "direct":
@@ -694,38 +859,37 @@ class LangGraphReferralAgent(BaseAgent):
         
         return suggestions
     
-    def _optimize_individual_path(self, path: Dict[str, Any], student_profile: Dict[str, Any]) -> Dict[str, Any]:
+    def _optimize_individual_path(self, path: Dict[str, Any], student_profile: Dict[str, Any],
+                                  target_companies: frozenset, student_skills: frozenset) -> Dict[str, Any]:
         """Optimize individual path based on student profile"""
         # Add personalization based on student profile
         path["personalization"] = {
-            "common_interests": self._find_common_interests(path, student_profile),
-            "conversation_starters": self._generate_conversation_starters(path, student_profile),
+            "common_interests": self._find_common_interests(path, student_profile, student_skills),
+            "conversation_starters": self._generate_conversation_starters(path, target_companies),
             "value_proposition": self._create_value_proposition(path, student_profile)
         }
         
         return path
     
-    def _find_common_interests(self, path: Dict[str, Any], student_profile: Dict[str, Any]) -> List[str]:
+    def _find_common_interests(self, path: Dict[str, Any], student_profile: Dict[str, Any],
+                               student_skills: frozenset) -> List[str]:
         """Find common interests between student and alumni"""
         alumni_details = path.get("alumni_details", [])
         if not alumni_details:
             return []
         
         alumni = alumni_details[0]
-        student_skills = set(student_profile.get("skills", []))
-        alumni_skills = set(alumni.get("skills", []))
         
-        common_skills = list(student_skills.intersection(alumni_skills))
+        # Sorted so the top 5 cut is deterministic
+        common_interests = sorted(student_skills.intersection(alumni.get("skills", [])))
         
         # Add other potential common interests
-        common_interests = common_skills.copy()
-        
         if student_profile.get("major") == alumni.get("major"):
             common_interests.append(f"Both studied {student_profile.get('major')}")
         
         return common_interests[:5]  # Top 5
     
-    def _generate_conversation_starters(self, path: Dict[str, Any], student_profile: Dict[str, Any]) -> List[str]:
+    def _generate_conversation_starters(self, path: Dict[str, Any], target_companies: frozenset) -> List[str]:
         """Generate conversation starters"""
         alumni_details = path.get("alumni_details", [])
         if not alumni_details:
@@ -740,7 +904,7 @@ class LangGraphReferralAgent(BaseAgent):
             starters.append(f"I noticed we both have experience with {shared_skills[0]}")
         
         # Company-based starter
-        if alumni.get("current_company") in student_profile.get("target_companies", []):
+        if alumni.get("current_company") in target_companies:
             starters.append(f"I'm very interested in opportunities at {alumni.get('current_company')}")
         
         # Role-based starter
@@ -798,66 +962,33 @@ class LangGraphReferralAgent(BaseAgent):
     
     def _create_action_plan(self, recommendation: Dict[str, Any]) -> Dict[str, Any]:
         """Create detailed action plan"""
+        # Reuse the steps attached in optimize_recommendations when available
+        next_steps = recommendation.get("next_steps") or self._generate_next_steps(recommendation)
+        
         return {
-            "immediate_actions": self._generate_next_steps(recommendation)[:2],
-            "follow_up_actions": self._generate_next_steps(recommendation)[2:],
-            "preparation_required": [
-                "Research company and role requirements",
-                "Prepare elevator pitch",
-                "Update resume if needed"
-            ],
+            "immediate_actions": next_steps[:2],
+            "follow_up_actions": next_steps[2:],
+            "preparation_required": list(PREPARATION_REQUIRED),
             "timeline": "1-2 weeks for initial contact, 2-4 weeks for referral process"
         }
     
     def _create_timeline(self, recommendation: Dict[str, Any]) -> Dict[str, str]:
         """Create timeline for referral process"""
-        return {
-            "day_1": "Research and prepare outreach",
-            "day_2-3": "Send initial contact",
-            "day_7-10": "Follow up if needed",
-            "day_14-21": "Referral conversation/interview",
-            "day_21-28": "Submit application with referral"
-        }
+        return dict(REFERRAL_TIMELINE)
     
     def _define_success_metrics(self, recommendation: Dict[str, Any]) -> Dict[str, str]:
         """Define success metrics"""
-    def _define_success_metrics(self, recommendation: Dict[str, Any]) -> Dict[str, str]:
-        """Define success metrics"""
-        return {
-            "response_rate": "Alumni responds within 7 days",
-            "engagement": "Positive response to referral request",
-            "referral_provided": "Alumni agrees to provide referral",
-            "application_success": "Application moves to interview stage",
-            "relationship_building": "Ongoing professional relationship established"
-        }
+        return dict(SUCCESS_METRICS)
     
     def _create_backup_plans(self, recommendation: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Create backup plans if primary path fails"""
-        backups = []
-        
-        # Alternative contact method
-        backups.append({
-            "type": "alternative_contact",
-            "description": "Try different contact method (LinkedIn vs email)",
-            "trigger": "No response after 7 days"
-        })
-        
-        # Alternative alumni
+        # Alternative contact method, alternative alumni and a different approach
         if recommendation.get("alternative_contacts"):
-            backups.append({
-                "type": "alternative_alumni",
-                "description": "Contact alternative alumni at same company",
-                "trigger": "Primary contact declines or doesn't respond"
-            })
-        
-        # Different approach
-        backups.append({
-            "type": "different_approach",
-            "description": "Try informational interview approach instead of direct referral request",
-            "trigger": "Referral request is declined"
-        })
+            backups = (BACKUP_ALTERNATIVE_CONTACT, BACKUP_ALTERNATIVE_ALUMNI, BACKUP_DIFFERENT_APPROACH)
+        else:
+            backups = (BACKUP_ALTERNATIVE_CONTACT, BACKUP_DIFFERENT_APPROACH)
         
-        return backups
+        return [dict(backup) for backup in backups]
     
     def _generate_recommendation_summary(self, recommendation: Dict[str, Any]) -> str:
         """Generate final recommendation summary"""
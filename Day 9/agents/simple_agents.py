@@ -5,12 +5,115 @@ Simplified AI agents that work without complex dependencies
 from typing import Dict, Any, List
 import logging
 import json
-import random
+import asyncio
+import hashlib
+import heapq
+import re
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
 from datetime import datetime
 from agents.base_agent import BaseAgent
 
 logger = logging.getLogger(__name__)
 
+# Number of distinct (student, alumni batch) match results kept per agent
+MATCH_CACHE_SIZE = 256
+
+# Number of alumni batches whose skill embeddings are kept for semantic matching
+EMBEDDING_CACHE_SIZE = 32
+
+# Number of set bits in every byte value, for popcounts over packed skill bitmasks
+POPCOUNT_TABLE = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint8)
+
+# Alumni documents sent per insert call when storing mined alumni
+ALUMNI_INSERT_BATCH_SIZE = 1000
+
+# Role seniority patterns used to estimate response times
+EXECUTIVE_ROLE_PATTERN = re.compile("director|vp")
+MANAGEMENT_ROLE_PATTERN = re.compile("manager|lead")
+
+# Fixed parts of every simple referral recommendation; kept immutable and
+# copied into each recommendation so callers can't change them for everyone
+RECOMMENDATION_NEXT_STEPS = (
+    "Research alumni's recent work and achievements",
+    "Craft personalized outreach message",
+    "Send LinkedIn connection request or email",
+    "Follow up if no response within a week"
+)
+
+RECOMMENDATION_IMMEDIATE_ACTIONS = (
+    "Review alumni's LinkedIn profile",
+    "Identify shared connections or interests"
+)
+
+RECOMMENDATION_FOLLOW_UP_ACTIONS = (
+    "Send personalized message",
+    "Schedule follow-up reminder"
+)
+
+RECOMMENDATION_TIMELINE = "1-2 weeks for initial contact"
+
+# Relevance is filled in per match
+RECOMMENDATION_EVALUATION = {
+    "accessibility": 0.8,
+    "influence": 0.7,
+    "responsiveness": 0.6,
+    "relevance": 0.5,
+    "timing": 0.8
+}
+
+# Outreach message templates, filled with str.format_map
+LINKEDIN_TEMPLATE = """Hi {alumni_name},
+
+I hope this message finds you well. I'm {student_name}, a {student_major} student graduating in {graduation_year}. I came across your profile and was impressed by your work at {alumni_company}.
+
+I'm very interested in opportunities in your field and would greatly appreciate any insights you might have about {alumni_company} or the industry in general. Your experience as a {alumni_role} is exactly the kind of career path I'm hoping to pursue.
+
+Would you be open to a brief conversation? I'd be happy to work around your schedule.
+
+Thank you for your time and consideration.
+
+Best regards,
+{student_name}"""
+
+EMAIL_TEMPLATE = """Subject: {student_major} Student Seeking Career Guidance
+
+Dear {alumni_name},
+
+I hope this email finds you well. My name is {student_name}, and I'm a {student_major} student graduating in {graduation_year}. I discovered your profile while researching professionals at {alumni_company}, and I was impressed by your career journey to your current role as {alumni_role}.
+
+I'm currently seeking opportunities in the tech industry and would be incredibly grateful for any advice or insights you might be willing to share about your experience at {alumni_company} or the field in general.
+
+I understand how valuable your time is, so I'd be happy to accommodate your schedule for a brief phone call or coffee meeting.
+
+Thank you very much for considering my request.
+
+Warm regards,
+{student_name}
+{student_email}"""
+
+FOLLOWUP_TEMPLATE = """Hi {alumni_name},
+
+I hope you're doing well. I wanted to follow up on my previous message about seeking career guidance.
+
+I understand you must be very busy, but if you have just 10-15 minutes in the coming weeks, I would be incredibly grateful for any insights you could share about your experience at {alumni_company}.
+
+Thank you again for your time and consideration.
+
+Best regards,
+{student_name}"""
+
+# (type, description, template, estimated read time, key elements, personalization score)
+MESSAGE_SPECS = (
+    ("linkedin", "LinkedIn connection message", LINKEDIN_TEMPLATE, "1 min",
+     ("Personal greeting", "Educational background", "Clear ask", "Professional closing"), 0.85),
+    ("email", "Professional email", EMAIL_TEMPLATE, "1-2 min",
+     ("Email subject line", "Personal greeting", "Educational background", "Clear ask", "Contact information"), 0.88),
+    ("followup", "Follow-up message", FOLLOWUP_TEMPLATE, "30 sec",
+     ("Personal greeting", "Brief follow-up", "Time consideration", "Professional closing"), 0.75),
+)
+
 class SimpleCrewAgent(BaseAgent):
     """Simplified CrewAI Alumni Mining Agent"""
     
@@ -30,9 +133,8 @@ class SimpleCrewAgent(BaseAgent):
             # Generate sample alumni data
             alumni_data = self._generate_sample_alumni(target_companies, graduation_years, role_filter, skills_filter)
             
-            # Store in database
-            if alumni_data:
-                self.db_client.insert_many_documents("alumni", alumni_data)
+            # Store in database without blocking the event loop
+            await asyncio.to_thread(self._store_alumni, alumni_data)
             
             self.log_activity("Completed alumni mining", {"alumni_count": len(alumni_data)})
             
@@ -47,6 +149,11 @@ class SimpleCrewAgent(BaseAgent):
             logger.error(f"Error in simple crew agent: {e}")
             return {"success": False, "error": str(e), "alumni_data": []}
     
+    def _store_alumni(self, alumni_data: List[Dict[str, Any]]):
+        """Insert alumni into the database in bounded batches"""
+        for start in range(0, len(alumni_data), ALUMNI_INSERT_BATCH_SIZE):
+            self.db_client.insert_many_documents("alumni", alumni_data[start:start + ALUMNI_INSERT_BATCH_SIZE])
+    
     def _generate_sample_alumni(self, companies: List[str], years: List[int], roles: List[str], skills: List[str]) -> List[Dict[str, Any]]:
         """Generate sample alumni data"""
         
@@ -57,42 +164,72 @@ class SimpleCrewAgent(BaseAgent):
         if not skills:
             skills = ["Python", "Java", "React", "AWS", "Machine Learning"]
         
-        alumni_list = []
-        num_alumni = random.randint(15, 25)
+        rng = np.random.default_rng()
+        num_alumni = int(rng.integers(15, 26))
         
         first_names = ["Alex", "Sarah", "Michael", "Emily", "David", "Jessica", "Daniel", "Lisa", "Chris", "Amanda"]
         last_names = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Wilson", "Moore"]
+        locations = ["San Francisco, CA", "Seattle, WA", "New York, NY", "Austin, TX"]
+        year_options = np.asarray(years) if years else np.arange(2015, 2024)
         
-        for i in range(num_alumni):
-            name = f"{random.choice(first_names)} {random.choice(last_names)}"
-            grad_year = random.choice(years) if years else random.randint(2015, 2023)
-            
-            alumni = {
-                "alumni_id": f"alumni_{i+1}_{name.replace(' ', '_').lower()}",
-                "name": name,
-                "graduation_year": grad_year,
-                "current_company": random.choice(companies),
-                "current_role": random.choice(roles),
-                "years_of_experience": 2024 - grad_year + random.randint(-1, 2),
-                "skills": random.sample(skills, min(len(skills), random.randint(3, 6))),
-                "industry": "Technology",
-                "location": random.choice(["San Francisco, CA", "Seattle, WA", "New York, NY", "Austin, TX"]),
-                "willing_to_refer": random.choice([True, True, True, False]),
-                "max_referrals_per_month": random.randint(2, 5),
-                "referral_count_this_month": random.randint(0, 2),
-                "email": f"{name.lower().replace(' ', '.')}@company.com",
-                "linkedin_url": f"https://linkedin.com/in/{name.lower().replace(' ', '-')}",
-                "created_at": datetime.now().isoformat()
-            }
-            alumni_list.append(alumni)
+        # Integer indices for every sampled field of every alumni
+        (first_idx, last_idx, year_idx, company_idx, role_idx, location_idx,
+         experience_offset, max_referrals, referral_count, skill_count, refer_draw), skill_order = \
+            self._sample_field_indices(rng, num_alumni, [
+                len(first_names), len(last_names), len(year_options), len(companies), len(roles), len(locations),
+                4,  # experience offset, -1..2
+                4,  # max referrals per month, 2..5
+                3,  # referrals this month, 0..2
+                4,  # skill count, 3..6
+                4   # willing to refer 3 times in 4
+            ], len(skills))
+        
+        names = [f"{first_names[f]} {last_names[l]}" for f, l in zip(first_idx.tolist(), last_idx.tolist())]
+        grad_years = year_options[year_idx]
         
-        return alumni_list
+        # Each alumni keeps the first 3-6 skills of its random order (at most all of them)
+        skill_samples = [
+            [skills[j] for j in order[:count]]
+            for order, count in zip(skill_order.tolist(), np.minimum(len(skills), skill_count + 3).tolist())
+        ]
+        
+        df = pd.DataFrame({
+            "alumni_id": [f"alumni_{i+1}_{name.replace(' ', '_').lower()}" for i, name in enumerate(names)],
+            "name": names,
+            "graduation_year": grad_years,
+            "current_company": [companies[i] for i in company_idx.tolist()],
+            "current_role": [roles[i] for i in role_idx.tolist()],
+            "years_of_experience": 2024 - grad_years + experience_offset - 1,
+            "skills": skill_samples,
+            "industry": "Technology",
+            "location": [locations[i] for i in location_idx.tolist()],
+            "willing_to_refer": refer_draw < 3,
+            "max_referrals_per_month": max_referrals + 2,
+            "referral_count_this_month": referral_count,
+            "email": [f"{name.lower().replace(' ', '.')}@company.com" for name in names],
+            "linkedin_url": [f"https://linkedin.com/in/{name.lower().replace(' ', '-')}" for name in names],
+            "created_at": datetime.now().isoformat()
+        })
+        
+        return df.to_dict("records")
+    
+    def _sample_field_indices(self, rng: np.random.Generator, num_alumni: int,
+                              field_sizes: List[int], num_skills: int) -> tuple:
+        """Draw an index below each field size for every alumni, plus a random skill order per alumni"""
+        indices = rng.integers(0, field_sizes, size=(num_alumni, len(field_sizes)))
+        skill_order = rng.random((num_alumni, num_skills)).argsort(axis=1)
+        return tuple(indices.T), skill_order
 
 class SimpleLangChainAgent(BaseAgent):
     """Simplified LangChain Domain Alignment Agent"""
     
     def __init__(self):
         super().__init__("Simple LangChain Domain Agent")
+        self._match_cache = OrderedDict()
+        
+        # Only loaded when semantic skill matching is enabled
+        self._embedding_model = None
+        self._alumni_embeddings = OrderedDict()
     
     async def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Process domain alignment"""
@@ -105,8 +242,8 @@ class SimpleLangChainAgent(BaseAgent):
             if not student_profile or not alumni_profiles:
                 return {"success": False, "error": "Missing required data", "matches": []}
             
-            # Calculate matches
-            matches = self._calculate_matches(student_profile, alumni_profiles)
+            # Calculate matches (reused when the same inputs are seen again)
+            matches = self._get_matches(student_profile, alumni_profiles)
             
             self.log_activity("Completed domain alignment", {"matches_found": len(matches)})
             
@@ -120,93 +257,271 @@ class SimpleLangChainAgent(BaseAgent):
             logger.error(f"Error in simple langchain agent: {e}")
             return {"success": False, "error": str(e), "matches": []}
     
+    def _get_matches(self, student: Dict[str, Any], alumni_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Return compatibility matches, memoized on the student profile and alumni fingerprints"""
+        key = self._match_cache_key(student, alumni_list)
+        if key is None:
+            return self._calculate_matches(student, alumni_list)
+        
+        matches = self._match_cache.get(key)
+        if matches is not None:
+            self._match_cache.move_to_end(key)
+        else:
+            matches = self._calculate_matches(student, alumni_list)
+            self._match_cache[key] = matches
+            if len(self._match_cache) > MATCH_CACHE_SIZE:
+                self._match_cache.popitem(last=False)
+        
+        # Callers get their own copies, so changing a result can't alter the cached one
+        return [self._copy_match(match) for match in matches]
+    
+    def _match_cache_key(self, student: Dict[str, Any], alumni_list: List[Dict[str, Any]]):
+        """Normalized student profile plus a fingerprint of each alumni, or None if uncacheable"""
+        if any(alumni.get("alumni_id") is None for alumni in alumni_list):
+            return None
+        
+        # Profiles get edited and the UI reuses ids for regenerated alumni, so
+        # the key covers every field that goes into a match record
+        alumni_fingerprints = tuple(
+            (
+                alumni.get("alumni_id"),
+                alumni.get("name"),
+                alumni.get("current_company"),
+                alumni.get("current_role"),
+                alumni.get("years_of_experience"),
+                tuple(alumni.get("skills") or ()),
+                alumni.get("willing_to_refer", True)
+            )
+            for alumni in alumni_list
+        )
+        
+        normalized_student = (
+            tuple(sorted(set(skill.lower() for skill in student.get("skills", [])))),
+            tuple(sorted(set(company.lower() for company in student.get("target_companies", [])))),
+            tuple(sorted(set(role.lower() for role in student.get("target_roles", [])))),
+            student.get("graduation_year", 2024)
+        )
+        key = (normalized_student, alumni_fingerprints)
+        
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+    
+    def _copy_match(self, match: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy a match record along with its nested breakdown and skills list"""
+        return {
+            **match,
+            "score_breakdown": dict(match["score_breakdown"]),
+            "matching_skills": list(match["matching_skills"])
+        }
+    
     def _calculate_matches(self, student: Dict[str, Any], alumni_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Calculate compatibility matches"""
-        matches = []
-        
         student_skills = set(skill.lower() for skill in student.get("skills", []))
         student_companies = set(company.lower() for company in student.get("target_companies", []))
         student_roles = set(role.lower() for role in student.get("target_roles", []))
         
+        soa = self._build_soa(alumni_list)
+        if not soa["alumni"]:
+            return []
+        
+        # Calculate compatibility scores for all alumni at once
+        skill_score = self._calculate_skill_match(student_skills, soa)
+        company_score = self._calculate_company_match(student_companies, *soa["companies"])
+        role_score = self._calculate_role_match(student_roles, *soa["roles"])
+        experience_score = self._calculate_experience_match(student.get("graduation_year", 2024), soa["experience"])
+        
+        # Overall compatibility
+        overall_score = (skill_score * 0.4 + company_score * 0.3 + role_score * 0.2 + experience_score * 0.1)
+        
+        # Only include decent matches, ranked by their reported (rounded) score
+        candidates = np.flatnonzero(overall_score > 0.3)
+        compatibility_scores = np.array([round(score, 3) for score in overall_score[candidates].tolist()])
+        
+        # Top 15 matches: partition to everything scoring at least the 15th best
+        # (keeping ties), then stable-sort only that shortlist
+        if len(candidates) > 15:
+            cutoff = np.partition(compatibility_scores, -15)[-15]
+            shortlist = np.flatnonzero(compatibility_scores >= cutoff)
+        else:
+            shortlist = np.arange(len(candidates))
+        top_indices = candidates[shortlist[np.argsort(-compatibility_scores[shortlist], kind="stable")[:15]]]
+        
+        # Build match records only for the returned alumni
+        matches = []
+        for i in top_indices.tolist():
+            alumni = soa["alumni"][i]
+            matches.append({
+                "alumni_id": alumni.get("alumni_id"),
+                "alumni_name": alumni.get("name"),
+                "current_company": alumni.get("current_company"),
+                "current_role": alumni.get("current_role"),
+                "compatibility_score": round(float(overall_score[i]), 3),
+                "score_breakdown": {
+                    "skill_compatibility": round(float(skill_score[i]), 3),
+                    "company_alignment": round(float(company_score[i]), 3),
+                    "role_relevance": round(float(role_score[i]), 3),
+                    "experience_level": round(float(experience_score[i]), 3)
+                },
+                "matching_skills": list(student_skills.intersection(soa["skill_sets"][i])),
+                "referral_potential": "high" if alumni.get("willing_to_refer", True) else "low"
+            })
+        
+        return matches
+    
+    def _build_soa(self, alumni_list: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Lay out the alumni fields used for matching as parallel columns"""
+        valid_alumni = []
+        skill_sets = []
+        companies = []
+        roles = []
+        experience = []
+        
         for alumni in alumni_list:
             try:
-                # Calculate compatibility scores
-                skill_score = self._calculate_skill_match(student_skills, alumni.get("skills", []))
-                company_score = self._calculate_company_match(student_companies, alumni.get("current_company", ""))
-                role_score = self._calculate_role_match(student_roles, alumni.get("current_role", ""))
-                experience_score = self._calculate_experience_match(student.get("graduation_year", 2024), alumni.get("years_of_experience", 0))
-                
-                # Overall compatibility
-                overall_score = (skill_score * 0.4 + company_score * 0.3 + role_score * 0.2 + experience_score * 0.1)
-                
-                if overall_score > 0.3:  # Only include decent matches
-                    match = {
-                        "alumni_id": alumni.get("alumni_id"),
-                        "alumni_name": alumni.get("name"),
-                        "current_company": alumni.get("current_company"),
-                        "current_role": alumni.get("current_role"),
-                        "compatibility_score": round(overall_score, 3),
-                        "score_breakdown": {
-                            "skill_compatibility": round(skill_score, 3),
-                            "company_alignment": round(company_score, 3),
-                            "role_relevance": round(role_score, 3),
-                            "experience_level": round(experience_score, 3)
-                        },
-                        "matching_skills": list(student_skills.intersection(set(skill.lower() for skill in alumni.get("skills", [])))),
-                        "referral_potential": "high" if alumni.get("willing_to_refer", True) else "low"
-                    }
-                    matches.append(match)
-                    
+                # Case-fold once here, so the vectorized scoring compares lowercase columns
+                alumni_skills = set(skill.lower() for skill in alumni.get("skills", []))
+                # A missing company or role scores like an empty one
+                company = (alumni.get("current_company") or "").lower()
+                role = (alumni.get("current_role") or "").lower()
+                years = float(alumni.get("years_of_experience", 0))
             except Exception as e:
                 logger.error(f"Error processing alumni {alumni.get('name', 'Unknown')}: {e}")
                 continue
+            
+            valid_alumni.append(alumni)
+            skill_sets.append(alumni_skills)
+            companies.append(company)
+            roles.append(role)
+            experience.append(years)
+        
+        # Skill presence over the skills any alumni has, packed 8 skills per byte
+        vocab = sorted(set().union(*skill_sets))
+        skill_index = {skill: i for i, skill in enumerate(vocab)}
+        skill_matrix = np.zeros((len(skill_sets), len(vocab)), dtype=bool)
+        for row, alumni_skills in enumerate(skill_sets):
+            skill_matrix[row, [skill_index[skill] for skill in alumni_skills]] = True
         
-        # Sort by compatibility score
-        matches.sort(key=lambda x: x["compatibility_score"], reverse=True)
-        return matches[:15]  # Return top 15 matches
+        return {
+            "alumni": valid_alumni,
+            "skill_sets": skill_sets,
+            "vocab": vocab,
+            "skill_bits": np.packbits(skill_matrix, axis=1),
+            "skill_counts": np.array([len(alumni_skills) for alumni_skills in skill_sets], dtype=np.int64),
+            # Dictionary-encoded: (distinct values, code of each alumni's value)
+            "companies": np.unique(np.array(companies, dtype=str), return_inverse=True),
+            "roles": np.unique(np.array(roles, dtype=str), return_inverse=True),
+            "experience": np.array(experience, dtype=float)
+        }
     
-    def _calculate_skill_match(self, student_skills: set, alumni_skills: List[str]) -> float:
-        """Calculate skill compatibility"""
-        alumni_skills_set = set(skill.lower() for skill in alumni_skills)
-        if not student_skills or not alumni_skills_set:
-            return 0.3
-        
-        intersection = student_skills.intersection(alumni_skills_set)
-        union = student_skills.union(alumni_skills_set)
-        return len(intersection) / len(union) if union else 0.0
+    def _calculate_skill_match(self, student_skills: set, soa: Dict[str, Any]) -> np.ndarray:
+        """Calculate skill compatibility (Jaccard) for every alumni"""
+        student_bits = np.packbits(np.array([skill in student_skills for skill in soa["vocab"]], dtype=bool))
+        
+        # Shared skills are the set bits of alumni AND student
+        alumni_counts = soa["skill_counts"]
+        intersection = POPCOUNT_TABLE[soa["skill_bits"] & student_bits].sum(axis=1, dtype=np.int64)
+        union = alumni_counts + len(student_skills) - intersection
+        
+        if not student_skills:
+            return np.full(len(alumni_counts), 0.3)
+        
+        if self.config.get("SEMANTIC_SKILL_MATCHING"):
+            similarity = self._calculate_semantic_skill_similarity(student_skills, soa)
+            if similarity is not None:
+                return np.where(alumni_counts == 0, 0.3, similarity)
+        
+        return np.where(alumni_counts == 0, 0.3, intersection / np.maximum(union, 1))
     
-    def _calculate_company_match(self, target_companies: set, alumni_company: str) -> float:
+    def _calculate_semantic_skill_similarity(self, student_skills: set, soa: Dict[str, Any]):
+        """Cosine similarity between the student's and every alumni's skill embeddings"""
+        model = self._get_embedding_model()
+        if model is None:
+            return None
+        
+        alumni_embeddings = self._embed_alumni_skills(model, soa["skill_sets"])
+        student_embedding = model.encode(
+            " ".join(sorted(student_skills)), convert_to_numpy=True, normalize_embeddings=True
+        ).astype(np.float32)
+        
+        # Normalized embeddings: one matrix-vector product gives every cosine
+        return np.clip(alumni_embeddings @ student_embedding, 0.0, 1.0)
+    
+    def _get_embedding_model(self):
+        """Load the sentence transformer on first use; None if it is unavailable"""
+        if self._embedding_model is None:
+            try:
+                from sentence_transformers import SentenceTransformer
+                self._embedding_model = SentenceTransformer(self.config["EMBEDDING_MODEL"])
+            except Exception as e:
+                logger.warning(f"Semantic skill matching unavailable, using skill overlap: {e}")
+                self._embedding_model = False
+        
+        return self._embedding_model or None
+    
+    def _embed_alumni_skills(self, model, skill_sets: List[set]) -> np.ndarray:
+        """Encode every alumni's skills in one batch, reused for the same alumni batch"""
+        texts = [" ".join(sorted(alumni_skills)) for alumni_skills in skill_sets]
+        key = hashlib.sha1("\n".join(texts).encode("utf-8")).hexdigest()
+        
+        embeddings = self._alumni_embeddings.get(key)
+        if embeddings is None:
+            embeddings = model.encode(
+                texts, batch_size=64, convert_to_numpy=True, normalize_embeddings=True
+            ).astype(np.float32)
+            self._alumni_embeddings[key] = embeddings
+            if len(self._alumni_embeddings) > EMBEDDING_CACHE_SIZE:
+                self._alumni_embeddings.popitem(last=False)
+        else:
+            self._alumni_embeddings.move_to_end(key)
+        
+        return embeddings
+    
+    def _calculate_company_match(self, target_companies: set, companies: np.ndarray,
+                                 company_codes: np.ndarray) -> np.ndarray:
         """Calculate company match"""
         if not target_companies:
-            return 0.5
+            return np.full(len(company_codes), 0.5)
         
-        alumni_company_lower = alumni_company.lower()
-        return 1.0 if alumni_company_lower in target_companies else 0.2
+        # Check each distinct company once, then spread to alumni by code
+        return np.where(np.isin(companies, list(target_companies)), 1.0, 0.2)[company_codes]
     
-    def _calculate_role_match(self, target_roles: set, alumni_role: str) -> float:
+    def _calculate_role_match(self, target_roles: set, roles: np.ndarray, role_codes: np.ndarray) -> np.ndarray:
         """Calculate role match"""
         if not target_roles:
-            return 0.5
+            return np.full(len(role_codes), 0.5)
         
-        alumni_role_lower = alumni_role.lower()
-        for target_role in target_roles:
-            if target_role in alumni_role_lower or alumni_role_lower in target_role:
-                return 1.0
-        return 0.3
+        # One scan per distinct role finds any target role inside it; the
+        # newline-joined targets answer whether the role is inside any target
+        target_pattern = re.compile("|".join(re.escape(target_role) for target_role in target_roles))
+        joined_targets = "\n".join(target_roles)
+        
+        role_scores = np.array([
+            1.0 if (
+                target_pattern.search(alumni_role)
+                or ("\n" not in alumni_role and alumni_role in joined_targets)
+            ) else 0.3
+            for alumni_role in roles.tolist()
+        ])
+        
+        return role_scores[role_codes]
     
-    def _calculate_experience_match(self, student_grad_year: int, alumni_experience: int) -> float:
+    def _calculate_experience_match(self, student_grad_year: int, alumni_experience: np.ndarray) -> np.ndarray:
         """Calculate experience level match"""
         ideal_gap = 3  # 3-7 years experience is ideal for mentoring
         actual_gap = alumni_experience
         
-        if 3 <= actual_gap <= 7:
-            return 1.0
-        elif 1 <= actual_gap < 3:
-            return 0.8
-        elif 7 < actual_gap <= 12:
-            return 0.7
-        else:
-            return 0.4
+        return np.select(
+            [
+                (3 <= actual_gap) & (actual_gap <= 7),
+                (1 <= actual_gap) & (actual_gap < 3),
+                (7 < actual_gap) & (actual_gap <= 12)
+            ],
+            [1.0, 0.8, 0.7],
+            default=0.4
+        )
 
 class SimpleLangGraphAgent(BaseAgent):
     """Simplified LangGraph Referral Path Agent"""
@@ -244,44 +559,31 @@ class SimpleLangGraphAgent(BaseAgent):
         """Generate referral path recommendations"""
         recommendations = []
         
-        for i, match in enumerate(matches[:8]):  # Top 8 matches
+        top_matches = heapq.nlargest(8, matches, key=lambda x: x.get("compatibility_score", 0.5))
+        
+        for i, match in enumerate(top_matches):  # Top 8 matches
             try:
+                score = match.get("compatibility_score", 0.5)
+                
                 # Create recommendation
                 recommendation = {
                     "path_id": f"path_{i+1}",
                     "type": "direct",
                     "alumni_details": [match],
-                    "score": match.get("compatibility_score", 0.5),
-                    "success_probability": min(match.get("compatibility_score", 0.5) + 0.1, 1.0),
-                    "connection_strength": match.get("compatibility_score", 0.5),
+                    "score": score,
+                    "success_probability": min(score + 0.1, 1.0),
+                    "connection_strength": score,
                     "estimated_response_time": self._estimate_response_time(match),
                     "path_description": f"Direct outreach to {match.get('alumni_name')} at {match.get('current_company')}",
                     "recommendation_rank": i + 1,
-                    "confidence_level": self._calculate_confidence(match.get("compatibility_score", 0.5)),
-                    "next_steps": [
-                        "Research alumni's recent work and achievements",
-                        "Craft personalized outreach message",
-                        "Send LinkedIn connection request or email",
-                        "Follow up if no response within a week"
-                    ],
+                    "confidence_level": self._calculate_confidence(score),
+                    "next_steps": list(RECOMMENDATION_NEXT_STEPS),
                     "action_plan": {
-                        "immediate_actions": [
-                            "Review alumni's LinkedIn profile",
-                            "Identify shared connections or interests"
-                        ],
-                        "follow_up_actions": [
-                            "Send personalized message",
-                            "Schedule follow-up reminder"
-                        ],
-                        "timeline": "1-2 weeks for initial contact"
+                        "immediate_actions": list(RECOMMENDATION_IMMEDIATE_ACTIONS),
+                        "follow_up_actions": list(RECOMMENDATION_FOLLOW_UP_ACTIONS),
+                        "timeline": RECOMMENDATION_TIMELINE
                     },
-                    "evaluation": {
-                        "accessibility": 0.8,
-                        "influence": 0.7,
-                        "responsiveness": 0.6,
-                        "relevance": match.get("compatibility_score", 0.5),
-                        "timing": 0.8
-                    }
+                    "evaluation": {**RECOMMENDATION_EVALUATION, "relevance": score}
                 }
                 
                 recommendations.append(recommendation)
@@ -297,9 +599,9 @@ class SimpleLangGraphAgent(BaseAgent):
         experience = alumni.get("years_of_experience", 0)
         role = alumni.get("current_role", "").lower()
         
-        if "director" in role or "vp" in role or experience > 10:
+        if experience > 10 or EXECUTIVE_ROLE_PATTERN.search(role):
             return "5-7 days"
-        elif "manager" in role or "lead" in role or experience > 5:
+        elif experience > 5 or MANAGEMENT_ROLE_PATTERN.search(role):
             return "3-5 days"
         else:
             return "1-3 days"
@@ -351,86 +653,30 @@ class SimpleAutoGenAgent(BaseAgent):
         alumni_details = referral.get("alumni_details", [{}])
         alumni = alumni_details[0] if alumni_details else {}
         
-        student_name = student.get("name", "Student")
-        alumni_name = alumni.get("alumni_name", alumni.get("name", "Alumni"))
-        student_major = student.get("major", "Computer Science")
-        alumni_company = alumni.get("current_company", "Company")
-        alumni_role = alumni.get("current_role", "Professional")
+        # Values shared by every template, read once
+        context = {
+            "student_name": student.get("name", "Student"),
+            "alumni_name": alumni.get("alumni_name", alumni.get("name", "Alumni")),
+            "student_major": student.get("major", "Computer Science"),
+            "graduation_year": student.get("graduation_year", 2025),
+            "student_email": student.get("email", "student@university.edu"),
+            "alumni_company": alumni.get("current_company", "Company"),
+            "alumni_role": alumni.get("current_role", "Professional")
+        }
         
         messages = []
         
-        # LinkedIn message
-        linkedin_msg = f"""Hi {alumni_name},
-
-I hope this message finds you well. I'm {student_name}, a {student_major} student graduating in {student.get('graduation_year', 2025)}. I came across your profile and was impressed by your work at {alumni_company}.
-
-I'm very interested in opportunities in your field and would greatly appreciate any insights you might have about {alumni_company} or the industry in general. Your experience as a {alumni_role} is exactly the kind of career path I'm hoping to pursue.
-
-Would you be open to a brief conversation? I'd be happy to work around your schedule.
-
-Thank you for your time and consideration.
-
-Best regards,
-{student_name}"""
-        
-        messages.append({
-            "type": "linkedin",
-            "description": "LinkedIn connection message",
-            "content": linkedin_msg,
-            "word_count": len(linkedin_msg.split()),
-            "estimated_read_time": "1 min",
-            "key_elements": ["Personal greeting", "Educational background", "Clear ask", "Professional closing"],
-            "personalization_score": 0.85
-        })
-        
-        # Email message
-        email_msg = f"""Subject: {student_major} Student Seeking Career Guidance
-
-Dear {alumni_name},
-
-I hope this email finds you well. My name is {student_name}, and I'm a {student_major} student graduating in {student.get('graduation_year', 2025)}. I discovered your profile while researching professionals at {alumni_company}, and I was impressed by your career journey to your current role as {alumni_role}.
-
-I'm currently seeking opportunities in the tech industry and would be incredibly grateful for any advice or insights you might be willing to share about your experience at {alumni_company} or the field in general.
-
-I understand how valuable your time is, so I'd be happy to accommodate your schedule for a brief phone call or coffee meeting.
-
-Thank you very much for considering my request.
-
-Warm regards,
-{student_name}
-{student.get('email', 'student@university.edu')}"""
-        
-        messages.append({
-            "type": "email",
-            "description": "Professional email",
-            "content": email_msg,
-            "word_count": len(email_msg.split()),
-            "estimated_read_time": "1-2 min",
-            "key_elements": ["Email subject line", "Personal greeting", "Educational background", "Clear ask", "Contact information"],
-            "personalization_score": 0.88
-        })
-        
-        # Follow-up message
-        followup_msg = f"""Hi {alumni_name},
-
-I hope you're doing well. I wanted to follow up on my previous message about seeking career guidance.
-
-I understand you must be very busy, but if you have just 10-15 minutes in the coming weeks, I would be incredibly grateful for any insights you could share about your experience at {alumni_company}.
-
-Thank you again for your time and consideration.
-
-Best regards,
-{student_name}"""
-        
-        messages.append({
-            "type": "followup",
-            "description": "Follow-up message",
-            "content": followup_msg,
-            "word_count": len(followup_msg.split()),
-            "estimated_read_time": "30 sec",
-            "key_elements": ["Personal greeting", "Brief follow-up", "Time consideration", "Professional closing"],
-            "personalization_score": 0.75
-        })
+        for message_type, description, template, read_time, key_elements, personalization_score in MESSAGE_SPECS:
+            content = template.format_map(context)
+            messages.append({
+                "type": message_type,
+                "description": description,
+                "content": content,
+                "word_count": len(content.split()),
+                "estimated_read_time": read_time,
+                "key_elements": list(key_elements),
+                "personalization_score": personalization_score
+            })
         
         return messages
     
@@ -446,4 +692,4 @@ Best regards,
                 "second_followup": "14 days after initial contact",
                 "thank_you": "Immediately after receiving response"
             }
-        }
\ No newline at end of file
+        }
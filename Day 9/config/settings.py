@@ -1,5 +1,7 @@
 import os
 from pathlib import Path
+from functools import lru_cache
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
 from dotenv import load_dotenv
 from typing import Dict, Any
 
@@ -8,6 +10,25 @@ load_dotenv()
 
 def load_config() -> Dict[str, Any]:
     """Load configuration from environment variables"""
+    # Environment variables don't change at runtime, so the config is built once;
+    # each caller gets its own copy to modify freely
+    return dict(_build_config())
+
+def _with_mongo_pool_options(uri: str, options: Dict[str, int]) -> str:
+    """Add connection pool options to a MongoDB URI, keeping any the URI already sets"""
+    parts = urlsplit(uri)
+    present = {key.lower() for key, _ in parse_qsl(parts.query, keep_blank_values=True)}
+    missing = urlencode([(key, value) for key, value in options.items() if key.lower() not in present])
+    if not missing:
+        return uri
+    
+    query = f"{parts.query}&{missing}" if parts.query else missing
+    # MongoDB requires a "/" between the host list and the options
+    return urlunsplit(parts._replace(path=parts.path or "/", query=query))
+
+@lru_cache(maxsize=1)
+def _build_config() -> Dict[str, Any]:
+    """Read the environment and create the project directories once per process"""
     
     project_root = Path(__file__).parent.parent
     
@@ -18,6 +39,10 @@ def load_config() -> Dict[str, Any]:
         # Database
         "MONGODB_URI": os.getenv("MONGODB_URI", "mongodb://localhost:27017/"),
         "DATABASE_NAME": os.getenv("DATABASE_NAME", "alumni_network"),
+        "MONGO_POOL_MAX": int(os.getenv("MONGO_POOL_MAX", "100")),
+        # Every agent opens its own client, so don't hold idle sockets by default
+        "MONGO_POOL_MIN": int(os.getenv("MONGO_POOL_MIN", "0")),
+        "MONGO_MAX_IDLE_TIME_MS": int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "300000")),
         
         # LinkedIn (for scraping)
         "LINKEDIN_EMAIL": os.getenv("LINKEDIN_EMAIL"),
@@ -40,12 +65,21 @@ def load_config() -> Dict[str, Any]:
         "MAX_ITERATIONS": 5,
         "TEMPERATURE": 0.7,
         "MAX_TOKENS": 4000,
+        "RAG_CANDIDATE_LIMIT": 50,
+        "SEMANTIC_SKILL_MATCHING": os.getenv("SEMANTIC_SKILL_MATCHING", "false").lower() == "true",
         
         # UI configurations
         "STREAMLIT_PORT": 8501,
         "PAGE_TITLE": "Alumni Referrer Network Builder",
     }
     
+    # Pool settings travel in the URI so every MongoClient built from it picks them up
+    config["MONGODB_URI"] = _with_mongo_pool_options(config["MONGODB_URI"], {
+        "maxPoolSize": config["MONGO_POOL_MAX"],
+        "minPoolSize": config["MONGO_POOL_MIN"],
+        "maxIdleTimeMS": config["MONGO_MAX_IDLE_TIME_MS"],
+    })
+    
     # Create necessary directories
     config["DATA_DIR"].mkdir(exist_ok=True)
     config["LOGS_DIR"].mkdir(exist_ok=True)
@@ -53,6 +87,12 @@ def load_config() -> Dict[str, Any]:
     
     return config
 
+def invalidate_config() -> None:
+    """Reload .env and drop the cached config so the next load_config() re-reads the environment"""
+    # load_dotenv() above only ran at import; override so edited .env values win
+    load_dotenv(override=True)
+    _build_config.cache_clear()
+
 # Validate required environment variables
 def validate_config(config: Dict[str, Any]) -> bool:
     """Validate that required configuration is present"""
@@ -33,11 +33,16 @@ def main():
     st.header("Test 3: Database Connection")
     try:
         from database.mongodb_client import MongoDBClient
+        # Connect fresh on every rerun so the result is live; close right away so
+        # reruns don't pile up open connections
         db_client = MongoDBClient()
-        if db_client.connect():
-            st.success("✅ Database connected successfully")
-        else:
-            st.error("❌ Database connection failed")
+        try:
+            if db_client.connect():
+                st.success("✅ Database connected successfully")
+            else:
+                st.error("❌ Database connection failed")
+        finally:
+            db_client.close()
     except Exception as e:
         st.error(f"❌ Database error: {e}")
     
@@ -5,7 +5,6 @@ Alumni Referrer Network Builder - Main Entry Point
 
 import sys
 import os
-import subprocess
 from pathlib import Path
 
 # Add project root to Python path
@@ -98,18 +97,20 @@ def initialize_project():
 
 def run_streamlit_app():
     """Run the Streamlit application"""
+    streamlit_path = project_root / "ui" / "streamlit_app.py"
+    
     try:
         print("🌐 Starting Streamlit UI...")
         print("📱 Open your browser and go to: http://localhost:8501")
         
-        streamlit_path = project_root / "ui" / "streamlit_app.py"
-        
         # Check if streamlit_app.py exists
         if not streamlit_path.exists():
             print(f"❌ Streamlit app not found at: {streamlit_path}")
             return False
         
-        subprocess.run([
+        # Replace this process with Streamlit instead of keeping a parent around
+        sys.stdout.flush()
+        os.execvp(sys.executable, [
             sys.executable, "-m", "streamlit", "run", 
             str(streamlit_path), 
             "--server.port=8501",
@@ -117,8 +118,6 @@ def run_streamlit_app():
             "--browser.gatherUsageStats=false"
         ])
         
-    except KeyboardInterrupt:
-        print("\n👋 Alumni Network Builder stopped by user")
     except Exception as e:
         print(f"❌ Failed to start Streamlit: {e}")
         print("Try running manually:")
@@ -169,65 +168,4 @@ if __name__ == "__main__":
     else:
         print("\n❌ Project initialization failed.")
         print("Run 'python main.py --help' for setup instructions.")
-        sys.exit(1)#!/usr/bin/env python3
-"""
-Alumni Referrer Network Builder - Main Entry Point
-"""
-
-import sys
-import os
-import subprocess
-from pathlib import Path
-
-# Add project root to Python path
-project_root = Path(__file__).parent
-sys.path.insert(0, str(project_root))
-
-from config.settings import load_config
-from utils.logger import setup_logging
-from database.mongodb_client import MongoDBClient
-
-def initialize_project():
-    """Initialize the project with necessary configurations"""
-    print("🚀 Initializing Alumni Referrer Network Builder...")
-    
-    # Load configuration
-    config = load_config()
-    
-    # Setup logging
-    logger = setup_logging()
-    logger.info("Starting Alumni Referrer Network Builder")
-    
-    # Initialize database
-    try:
-        db_client = MongoDBClient()
-        db_client.connect()
-        logger.info("Database connection established")
-    except Exception as e:
-        logger.error(f"Database connection failed: {e}")
-        print("❌ Database connection failed. Please check your MongoDB setup.")
-        return False
-    
-    print("✅ Project initialized successfully!")
-    return True
-
-def run_streamlit_app():
-    """Run the Streamlit application"""
-    try:
-        print("🌐 Starting Streamlit UI...")
-        streamlit_path = project_root / "ui" / "streamlit_app_fixed.py"
-        subprocess.run([
-            sys.executable, "-m", "streamlit", "run", 
-            str(streamlit_path), 
-            "--server.port=8501",
-            "--server.headless=true"
-        ])
-    except Exception as e:
-        print(f"❌ Failed to start Streamlit: {e}")
-
-if __name__ == "__main__":
-    if initialize_project():
-        run_streamlit_app()
-    else:
-        print("❌ Project initialization failed. Please check the configuration.")
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)
@@ -1,52 +1,153 @@
 import chromadb
 from chromadb.config import Settings
 from sentence_transformers import SentenceTransformer
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, NamedTuple
+import os
 import logging
 import json
+import asyncio
 import uuid
+import heapq
+import re
+import threading
+import time
+import numpy as np
 from pathlib import Path
+from collections import OrderedDict, Counter
+from functools import cached_property, lru_cache
+from operator import itemgetter
 from config.settings import load_config
 
 logger = logging.getLogger(__name__)
 
+EMBEDDING_BATCH_SIZE = 64
+# Every stored and query vector is unit-length, so one index never mixes scales
+NORMALIZE_EMBEDDINGS = True
+QUERY_EMBEDDING_CACHE_SIZE = 1024
+RESULT_CACHE_SIZE = 256
+RESULT_CACHE_TTL_SECONDS = 300
+
+# Keyword patterns used to classify search queries (substring matches)
+COMPANY_QUERY_PATTERN = re.compile("company|corp|inc|ltd")
+ROLE_QUERY_PATTERN = re.compile("engineer|manager|director|analyst")
+SKILL_QUERY_PATTERN = re.compile("python|java|react|aws|data")
+
+# Metadata fields whose absence is reported as a data gap
+REQUIRED_METADATA_FIELDS = ["company", "role", "skills", "years_of_experience"]
+
+@lru_cache(maxsize=4096)
+def _parse_skills(skills: str) -> frozenset:
+    return frozenset(skills.split(", "))
+
+def skill_set(skills) -> frozenset:
+    """Skills stored in metadata (comma-joined string or list) as a set, parsed once per distinct string"""
+    if isinstance(skills, str):
+        return _parse_skills(skills)
+    return frozenset(skills)
+
+class ResultAggregate(NamedTuple):
+    """Search result statistics shared by the insight generators, collected in one pass"""
+    total: int
+    average_similarity: float
+    companies: List[str]
+    roles: List[str]
+    skills: List[str]
+    experience_levels: List[float]
+    missing_field_counts: Dict[str, int]
+    recent_profiles: int
+
+# One Chroma client per store path for the whole process, shared by every pipeline
+_chroma_clients: Dict[str, Any] = {}
+_chroma_clients_lock = threading.Lock()
+
+def _prefetch_store_files(path: str):
+    """Ask the kernel to start reading the vector store files into the page cache"""
+    if not hasattr(os, "posix_fadvise"):
+        return
+    
+    for file_path in Path(path).rglob("*"):
+        if not file_path.is_file():
+            continue
+        try:
+            fd = os.open(file_path, os.O_RDONLY)
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+            finally:
+                os.close(fd)
+        except OSError as e:
+            logger.debug(f"Could not prefetch {file_path}: {e}")
+
+def _get_chroma_client(path: str):
+    """Return the shared Chroma client for path, opening it on first use"""
+    with _chroma_clients_lock:
+        client = _chroma_clients.get(path)
+        if client is None:
+            client = chromadb.PersistentClient(
+                path=path,
+                settings=Settings(
+                    anonymized_telemetry=False,
+                    allow_reset=True
+                )
+            )
+            _chroma_clients[path] = client
+            _prefetch_store_files(path)
+        return client
+
+# Cached lookup results per store path. Pipelines on the same store share one
+# cache, so a write through any of them invalidates it for all.
+_result_caches: Dict[str, OrderedDict] = {}
+_result_caches_lock = threading.RLock()
+
+def _get_result_cache(path: str) -> OrderedDict:
+    """Return the shared lookup result cache for path"""
+    with _result_caches_lock:
+        return _result_caches.setdefault(path, OrderedDict())
+
 class RAGPipeline:
     """Retrieval-Augmented Generation pipeline for alumni data"""
     
     def __init__(self):
         """Initialize RAG pipeline"""
         self.config = load_config()
-        self._setup_embeddings()
-        self._setup_vector_store()
+        self._query_embeddings = OrderedDict()
+        # Pipelines are shared across Streamlit sessions, so searches can run in parallel
+        self._query_embeddings_lock = threading.Lock()
+        self._result_cache = _get_result_cache(str(self.config["VECTOR_STORE_PATH"]))
     
-    def _setup_embeddings(self):
-        """Setup embedding model"""
+    # The model and the vector store are opened on first use, so constructing a
+    # pipeline stays cheap for code paths that never encode or query
+    @cached_property
+    def embedding_model(self):
+        """Embedding model"""
         try:
-            self.embedding_model = SentenceTransformer(self.config["EMBEDDING_MODEL"])
+            embedding_model = SentenceTransformer(self.config["EMBEDDING_MODEL"])
             logger.info(f"Loaded embedding model: {self.config['EMBEDDING_MODEL']}")
+            return embedding_model
         except Exception as e:
             logger.error(f"Failed to load embedding model: {e}")
             raise
     
-    def _setup_vector_store(self):
-        """Setup ChromaDB vector store"""
+    @cached_property
+    def chroma_client(self):
+        """Process-wide persistent ChromaDB client"""
+        try:
+            return _get_chroma_client(str(self.config["VECTOR_STORE_PATH"]))
+        except Exception as e:
+            logger.error(f"Failed to setup vector store: {e}")
+            raise
+    
+    @cached_property
+    def collection(self):
+        """ChromaDB alumni collection"""
         try:
-            # Create persistent client
-            self.chroma_client = chromadb.PersistentClient(
-                path=str(self.config["VECTOR_STORE_PATH"]),
-                settings=Settings(
-                    anonymized_telemetry=False,
-                    allow_reset=True
-                )
-            )
-            
             # Get or create collection
-            self.collection = self.chroma_client.get_or_create_collection(
+            collection = self.chroma_client.get_or_create_collection(
                 name="alumni_network",
                 metadata={"description": "Alumni profiles and network data"}
             )
             
             logger.info("ChromaDB vector store initialized")
+            return collection
             
         except Exception as e:
             logger.error(f"Failed to setup vector store: {e}")
@@ -55,21 +156,26 @@ class RAGPipeline:
     async def add_document(self, document_text: str, metadata: Dict[str, Any], doc_id: Optional[str] = None) -> str:
         """Add document to vector store"""
         try:
-            # Generate embedding
-            embedding = self.embedding_model.encode(document_text).tolist()
+            # Generate embedding (kept as a float32 array, Chroma takes it as-is)
+            embeddings = await asyncio.to_thread(
+                self.embedding_model.encode, [document_text], convert_to_numpy=True,
+                normalize_embeddings=NORMALIZE_EMBEDDINGS
+            )
             
             # Generate ID if not provided
             if not doc_id:
                 doc_id = str(uuid.uuid4())
             
             # Add to collection
-            self.collection.add(
-                embeddings=[embedding],
+            await asyncio.to_thread(
+                self.collection.add,
+                embeddings=embeddings,
                 documents=[document_text],
                 metadatas=[metadata],
                 ids=[doc_id]
             )
             
+            self._invalidate_result_cache()
             logger.info(f"Added document to vector store: {doc_id}")
             return doc_id
             
@@ -80,32 +186,30 @@ class RAGPipeline:
     async def add_documents_batch(self, documents: List[Dict[str, Any]]) -> List[str]:
         """Add multiple documents to vector store"""
         try:
-            embeddings = []
-            texts = []
-            metadatas = []
-            ids = []
-            
-            for doc in documents:
-                text = doc.get("text", "")
-                metadata = doc.get("metadata", {})
-                doc_id = doc.get("id", str(uuid.uuid4()))
-                
-                # Generate embedding
-                embedding = self.embedding_model.encode(text).tolist()
-                
-                embeddings.append(embedding)
-                texts.append(text)
-                metadatas.append(metadata)
-                ids.append(doc_id)
+            texts = [doc.get("text", "") for doc in documents]
+            metadatas = [doc.get("metadata", {}) for doc in documents]
+            ids = [doc.get("id", str(uuid.uuid4())) for doc in documents]
+            
+            # Generate all embeddings in one batched forward pass
+            embeddings = await asyncio.to_thread(
+                self.embedding_model.encode,
+                texts,
+                batch_size=EMBEDDING_BATCH_SIZE,
+                show_progress_bar=False,
+                convert_to_numpy=True,
+                normalize_embeddings=NORMALIZE_EMBEDDINGS
+            )
             
             # Add batch to collection
-            self.collection.add(
+            await asyncio.to_thread(
+                self.collection.add,
                 embeddings=embeddings,
                 documents=texts,
                 metadatas=metadatas,
                 ids=ids
             )
             
+            self._invalidate_result_cache()
             logger.info(f"Added {len(documents)} documents to vector store")
             return ids
             
@@ -113,11 +217,27 @@ class RAGPipeline:
             logger.error(f"Failed to add documents batch to vector store: {e}")
             raise
     
-    def search(self, query: str, limit: int = 10, filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
-        """Search vector store for relevant documents"""
+    async def add_documents_batch_concurrent(self, documents: List[Dict[str, Any]],
+                                             concurrency: int = 8) -> List[str]:
+        """Add documents in shards, overlapping encoding of one shard with writes of another"""
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def add_shard(shard: List[Dict[str, Any]]) -> List[str]:
+            async with semaphore:
+                return await self.add_documents_batch(shard)
+        
+        shards = [documents[i:i + EMBEDDING_BATCH_SIZE]
+                  for i in range(0, len(documents), EMBEDDING_BATCH_SIZE)]
+        shard_ids = await asyncio.gather(*(add_shard(shard) for shard in shards))
+        
+        return [doc_id for ids in shard_ids for doc_id in ids]
+    
+    def search(self, query: str, limit: int = 10, filters: Optional[Dict[str, Any]] = None,
+               include_documents: bool = True) -> List[Dict[str, Any]]:
+        """Search vector store for relevant documents (skip document text with include_documents=False)"""
         try:
             # Generate query embedding
-            query_embedding = self.embedding_model.encode(query).tolist()
+            query_embeddings = self._encode_query(query)
             
             # Prepare where clause for filtering
             where_clause = None
@@ -132,11 +252,15 @@ class RAGPipeline:
                         where_clause[key] = {"$eq": value}
             
             # Search collection
+            include = ["metadatas", "distances"]
+            if include_documents:
+                include.insert(0, "documents")
+            
             results = self.collection.query(
-                query_embeddings=[query_embedding],
+                query_embeddings=query_embeddings,
                 n_results=limit,
                 where=where_clause,
-                include=["documents", "metadatas", "distances"]
+                include=include
             )
             
             # Format results
@@ -144,7 +268,7 @@ class RAGPipeline:
             for i in range(len(results["ids"][0])):
                 result = {
                     "id": results["ids"][0][i],
-                    "document": results["documents"][0][i],
+                    "document": results["documents"][0][i] if include_documents else None,
                     "metadata": results["metadatas"][0][i],
                     "similarity_score": 1 - results["distances"][0][i],  # Convert distance to similarity
                     "relevance_rank": i + 1
@@ -158,6 +282,66 @@ class RAGPipeline:
             logger.error(f"Failed to search vector store: {e}")
             return []
     
+    def _encode_query(self, query: str):
+        """Encode a search query, reusing the embedding when the same query repeats"""
+        with self._query_embeddings_lock:
+            query_embeddings = self._query_embeddings.get(query)
+            if query_embeddings is not None:
+                self._query_embeddings.move_to_end(query)
+                return query_embeddings
+        
+        # Encode outside the lock so one slow query doesn't hold up the others
+        query_embeddings = self.embedding_model.encode(
+            [query], convert_to_numpy=True, normalize_embeddings=NORMALIZE_EMBEDDINGS
+        )
+        query_embeddings.setflags(write=False)
+        
+        with self._query_embeddings_lock:
+            self._query_embeddings[query] = query_embeddings
+            self._query_embeddings.move_to_end(query)
+            if len(self._query_embeddings) > QUERY_EMBEDDING_CACHE_SIZE:
+                self._query_embeddings.popitem(last=False)
+        
+        return query_embeddings
+    
+    def _get_cached_results(self, key: tuple) -> Optional[List[Dict[str, Any]]]:
+        """Return a copy of unexpired cached lookup results, or None"""
+        with _result_caches_lock:
+            entry = self._result_cache.get(key)
+            if entry is None:
+                return None
+            
+            cached_at, results = entry
+            if time.monotonic() - cached_at > RESULT_CACHE_TTL_SECONDS:
+                del self._result_cache[key]
+                return None
+            
+            self._result_cache.move_to_end(key)
+            return [self._copy_result(result) for result in results]
+    
+    def _cache_results(self, key: tuple, results: List[Dict[str, Any]]):
+        """Cache lookup results; empty lists are skipped since search() also returns [] on errors"""
+        if not results:
+            return
+        
+        with _result_caches_lock:
+            self._result_cache[key] = (time.monotonic(), [self._copy_result(result) for result in results])
+            self._result_cache.move_to_end(key)
+            if len(self._result_cache) > RESULT_CACHE_SIZE:
+                self._result_cache.popitem(last=False)
+    
+    def _copy_result(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy a lookup result along with its metadata, so callers can change either freely"""
+        copied = dict(result)
+        if copied.get("metadata") is not None:
+            copied["metadata"] = dict(copied["metadata"])
+        return copied
+    
+    def _invalidate_result_cache(self):
+        """Drop cached lookups after the collection changes, for every pipeline on this store"""
+        with _result_caches_lock:
+            self._result_cache.clear()
+    
     def search_with_context(self, query: str, context_filters: Dict[str, Any], 
                           limit: int = 10) -> Dict[str, Any]:
         """Search with additional context and generate insights"""
@@ -210,10 +394,11 @@ class RAGPipeline:
             results = self.search(search_text, limit, filters)
             
             # Enhance results with similarity analysis
-            for result in results:
-                result["similarity_analysis"] = self._analyze_similarity(
-                    alumni_profile, result.get("metadata", {})
-                )
+            similarity_analyses = self._analyze_similarity(
+                alumni_profile, [result.get("metadata", {}) for result in results]
+            )
+            for result, similarity_analysis in zip(results, similarity_analyses):
+                result["similarity_analysis"] = similarity_analysis
             
             return results
             
@@ -223,6 +408,11 @@ class RAGPipeline:
     
     def get_alumni_by_company(self, company_name: str, limit: int = 10) -> List[Dict[str, Any]]:
         """Get alumni from specific company"""
+        cache_key = ("company", company_name, limit)
+        cached = self._get_cached_results(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
             filters = {
                 "type": "alumni_profile",
@@ -230,11 +420,12 @@ class RAGPipeline:
             }
             
             query = f"Alumni working at {company_name}"
-            results = self.search(query, limit, filters)
+            results = self.search(query, limit, filters, include_documents=False)
             
             # Sort by experience level
             results.sort(key=lambda x: x.get("metadata", {}).get("years_of_experience", 0), reverse=True)
             
+            self._cache_results(cache_key, results)
             return results
             
         except Exception as e:
@@ -243,6 +434,12 @@ class RAGPipeline:
     
     def get_alumni_by_skills(self, skills: List[str], limit: int = 10) -> List[Dict[str, Any]]:
         """Get alumni with specific skills"""
+        # Skill order shapes the query text, so it is part of the key
+        cache_key = ("skills", tuple(skills), limit)
+        cached = self._get_cached_results(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
             query = f"Alumni with skills: {', '.join(skills)}"
             
@@ -250,21 +447,20 @@ class RAGPipeline:
                 "type": "alumni_profile"
             }
             
-            results = self.search(query, limit, filters)
+            results = self.search(query, limit, filters, include_documents=False)
             
             # Rank by skill match count
+            skills_set = set(skills)
             for result in results:
-                alumni_skills = result.get("metadata", {}).get("skills", [])
-                if isinstance(alumni_skills, str):
-                    alumni_skills = alumni_skills.split(", ")
-                
-                skill_matches = len(set(skills).intersection(set(alumni_skills)))
+                alumni_skills = skill_set(result.get("metadata", {}).get("skills", []))
+                skill_matches = len(skills_set.intersection(alumni_skills))
                 result["skill_match_count"] = skill_matches
                 result["skill_match_percentage"] = skill_matches / len(skills) if skills else 0
             
             # Sort by skill match count
-            results.sort(key=lambda x: x.get("skill_match_count", 0), reverse=True)
+            results.sort(key=itemgetter("skill_match_count"), reverse=True)
             
+            self._cache_results(cache_key, results)
             return results
             
         except Exception as e:
@@ -275,16 +471,19 @@ class RAGPipeline:
         """Update existing document"""
         try:
             # Generate new embedding
-            embedding = self.embedding_model.encode(updated_text).tolist()
+            embeddings = self.embedding_model.encode(
+                [updated_text], convert_to_numpy=True, normalize_embeddings=NORMALIZE_EMBEDDINGS
+            )
             
             # Update in collection
             self.collection.update(
                 ids=[doc_id],
-                embeddings=[embedding],
+                embeddings=embeddings,
                 documents=[updated_text],
                 metadatas=[updated_metadata]
             )
             
+            self._invalidate_result_cache()
             logger.info(f"Updated document in vector store: {doc_id}")
             return True
             
@@ -296,6 +495,7 @@ class RAGPipeline:
         """Delete document from vector store"""
         try:
             self.collection.delete(ids=[doc_id])
+            self._invalidate_result_cache()
             logger.info(f"Deleted document from vector store: {doc_id}")
             return True
             
@@ -303,6 +503,28 @@ class RAGPipeline:
             logger.error(f"Failed to delete document: {e}")
             return False
     
+    def warmup(self) -> bool:
+        """Load the embedding model and probe the index so the first real query is fast"""
+        try:
+            query_embeddings = self.embedding_model.encode(
+                ["warmup"], convert_to_numpy=True, normalize_embeddings=NORMALIZE_EMBEDDINGS
+            )
+            
+            # One tiny query pages the HNSW segment in from disk
+            if self.collection.count():
+                self.collection.query(
+                    query_embeddings=query_embeddings,
+                    n_results=1,
+                    include=["distances"]
+                )
+            
+            logger.info("RAG pipeline warmed up")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Failed to warm up RAG pipeline: {e}")
+            return False
+    
     def get_collection_stats(self) -> Dict[str, Any]:
         """Get statistics about the collection"""
         try:
@@ -362,9 +584,7 @@ class RAGPipeline:
             results = self.search(semantic_query, limit * 2, filters)  # Get more for filtering
             
             # Post-process and rank results
-            processed_results = self._post_process_semantic_results(results, search_criteria)
-            
-            return processed_results[:limit]
+            return self._post_process_semantic_results(results, search_criteria, limit)
             
         except Exception as e:
             logger.error(f"Failed to perform semantic search: {e}")
@@ -373,49 +593,29 @@ class RAGPipeline:
     def _generate_search_insights(self, query: str, results: List[Dict[str, Any]], 
                                 context_filters: Dict[str, Any]) -> Dict[str, Any]:
         """Generate insights from search results"""
+        aggregate = self._aggregate_results(results)
+        
         insights = {
             "query_analysis": self._analyze_query(query),
-            "result_patterns": self._analyze_result_patterns(results),
-            "recommendations": self._generate_recommendations(results, context_filters),
-            "data_gaps": self._identify_data_gaps(results, context_filters)
+            "result_patterns": self._analyze_result_patterns(aggregate),
+            "recommendations": self._generate_recommendations(aggregate, context_filters),
+            "data_gaps": self._identify_data_gaps(aggregate, context_filters)
         }
         
         return insights
     
-    def _analyze_query(self, query: str) -> Dict[str, Any]:
-        """Analyze the search query"""
-        query_lower = query.lower()
-        
-        analysis = {
-            "query_type": "general",
-            "contains_company": any(keyword in query_lower for keyword in ["company", "corp", "inc", "ltd"]),
-            "contains_role": any(keyword in query_lower for keyword in ["engineer", "manager", "director", "analyst"]),
-            "contains_skills": any(keyword in query_lower for keyword in ["python", "java", "react", "aws", "data"]),
-            "specificity_score": len(query.split()) / 10.0  # Simple specificity measure
-        }
-        
-        # Determine query type
-        if analysis["contains_company"]:
-            analysis["query_type"] = "company_focused"
-        elif analysis["contains_role"]:
-            analysis["query_type"] = "role_focused"
-        elif analysis["contains_skills"]:
-            analysis["query_type"] = "skill_focused"
-        
-        return analysis
-    
-    def _analyze_result_patterns(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Analyze patterns in search results"""
-        if not results:
-            return {"pattern_summary": "No results to analyze"}
-        
-        # Extract metadata for analysis
+    def _aggregate_results(self, results: List[Dict[str, Any]]) -> ResultAggregate:
+        """Walk the search results once, collecting everything the insights need"""
+        similarity_total = 0
         companies = []
         roles = []
         skills = []
         experience_levels = []
+        missing_field_counts = dict.fromkeys(REQUIRED_METADATA_FIELDS, 0)
+        recent_profiles = 0
         
         for result in results:
+            similarity_total += result.get("similarity_score", 0)
             metadata = result.get("metadata", {})
             
             if metadata.get("company"):
@@ -432,47 +632,91 @@ class RAGPipeline:
             
             if metadata.get("years_of_experience"):
                 experience_levels.append(metadata["years_of_experience"])
+            
+            for field in REQUIRED_METADATA_FIELDS:
+                if not metadata.get(field):
+                    missing_field_counts[field] += 1
+            
+            if metadata.get("years_of_experience", 0) <= 2:
+                recent_profiles += 1
+        
+        return ResultAggregate(
+            total=len(results),
+            average_similarity=similarity_total / len(results) if results else 0.0,
+            companies=companies,
+            roles=roles,
+            skills=skills,
+            experience_levels=experience_levels,
+            missing_field_counts=missing_field_counts,
+            recent_profiles=recent_profiles
+        )
+    
+    def _analyze_query(self, query: str) -> Dict[str, Any]:
+        """Analyze the search query"""
+        query_lower = query.lower()
+        
+        analysis = {
+            "query_type": "general",
+            "contains_company": COMPANY_QUERY_PATTERN.search(query_lower) is not None,
+            "contains_role": ROLE_QUERY_PATTERN.search(query_lower) is not None,
+            "contains_skills": SKILL_QUERY_PATTERN.search(query_lower) is not None,
+            "specificity_score": len(query.split()) / 10.0  # Simple specificity measure
+        }
+        
+        # Determine query type
+        if analysis["contains_company"]:
+            analysis["query_type"] = "company_focused"
+        elif analysis["contains_role"]:
+            analysis["query_type"] = "role_focused"
+        elif analysis["contains_skills"]:
+            analysis["query_type"] = "skill_focused"
+        
+        return analysis
+    
+    def _analyze_result_patterns(self, aggregate: ResultAggregate) -> Dict[str, Any]:
+        """Analyze patterns in search results"""
+        if not aggregate.total:
+            return {"pattern_summary": "No results to analyze"}
         
         # Count frequencies
-        from collections import Counter
+        experience = np.array(aggregate.experience_levels, dtype=float)
+        junior = int(np.count_nonzero(experience < 3))
+        senior = int(np.count_nonzero(experience > 7))
         
         patterns = {
-            "top_companies": dict(Counter(companies).most_common(5)),
-            "top_roles": dict(Counter(roles).most_common(5)),
-            "top_skills": dict(Counter(skills).most_common(10)),
+            "top_companies": dict(Counter(aggregate.companies).most_common(5)),
+            "top_roles": dict(Counter(aggregate.roles).most_common(5)),
+            "top_skills": dict(Counter(aggregate.skills).most_common(10)),
             "experience_distribution": {
-                "junior": len([exp for exp in experience_levels if exp < 3]),
-                "mid": len([exp for exp in experience_levels if 3 <= exp <= 7]),
-                "senior": len([exp for exp in experience_levels if exp > 7])
+                "junior": junior,
+                "mid": len(experience) - junior - senior,
+                "senior": senior
             },
-            "average_similarity": sum(r.get("similarity_score", 0) for r in results) / len(results)
+            "average_similarity": aggregate.average_similarity
         }
         
         return patterns
     
-    def _generate_recommendations(self, results: List[Dict[str, Any]], 
+    def _generate_recommendations(self, aggregate: ResultAggregate, 
                                 context_filters: Dict[str, Any]) -> List[str]:
         """Generate recommendations based on search results"""
         recommendations = []
         
-        if not results:
+        if not aggregate.total:
             recommendations.append("Try broadening your search criteria")
             recommendations.append("Consider adding more alumni profiles to the database")
             return recommendations
         
-        avg_similarity = sum(r.get("similarity_score", 0) for r in results) / len(results)
-        
-        if avg_similarity < 0.5:
+        if aggregate.average_similarity < 0.5:
             recommendations.append("Consider refining your search terms for better matches")
         
-        if len(results) < 5:
+        if aggregate.total < 5:
             recommendations.append("Expand the search to include more graduation years or companies")
         
         # Check diversity
-        companies = [r.get("metadata", {}).get("company") for r in results]
-        unique_companies = len(set(filter(None, companies)))
+        unique_companies = len(set(aggregate.companies))
         
-        if unique_companies < len(results) / 2:
+        if unique_companies < aggregate.total / 2:
             recommendations.append("Search results show concentration in few companies - consider diversifying")
         
         if context_filters.get("type") == "alumni_profile":
@@ -480,75 +724,95 @@ class RAGPipeline:
         
         return recommendations
     
-    def _identify_data_gaps(self, results: List[Dict[str, Any]], 
+    def _identify_data_gaps(self, aggregate: ResultAggregate, 
                           context_filters: Dict[str, Any]) -> List[str]:
         """Identify gaps in the data"""
         gaps = []
         
-        if not results:
+        if not aggregate.total:
             gaps.append("No relevant alumni data found")
             return gaps
         
         # Check for missing metadata fields
-        missing_fields = []
-        required_fields = ["company", "role", "skills", "years_of_experience"]
-        
-        for field in required_fields:
-            missing_count = sum(1 for r in results if not r.get("metadata", {}).get(field))
-            if missing_count > len(results) * 0.3:  # More than 30% missing
-                missing_fields.append(field)
+        missing_fields = [
+            field for field, missing_count in aggregate.missing_field_counts.items()
+            if missing_count > aggregate.total * 0.3  # More than 30% missing
+        ]
         
         if missing_fields:
             gaps.append(f"Many profiles missing: {', '.join(missing_fields)}")
         
         # Check for recent data
-        recent_profiles = sum(1 for r in results 
-                            if r.get("metadata", {}).get("years_of_experience", 0) <= 2)
-        
-        if recent_profiles < len(results) * 0.2:  # Less than 20% recent graduates
+        if aggregate.recent_profiles < aggregate.total * 0.2:  # Less than 20% recent graduates
             gaps.append("Limited recent graduate data available")
         
         return gaps
     
-    def _analyze_similarity(self, profile1: Dict[str, Any], profile2: Dict[str, Any]) -> Dict[str, Any]:
-        """Analyze similarity between two alumni profiles"""
-        similarity_factors = {}
-        
-        # Company similarity
-        if profile1.get("current_company") == profile2.get("company"):
-            similarity_factors["same_company"] = True
-        
-        # Role similarity
-        role1 = profile1.get("current_role", "").lower()
-        role2 = profile2.get("role", "").lower()
-        similarity_factors["role_similarity"] = self._calculate_text_similarity(role1, role2)
-        
-        # Skills similarity
-        skills1 = set(profile1.get("skills", []))
-        skills2_str = profile2.get("skills", "")
-        skills2 = set(skills2_str.split(", ") if isinstance(skills2_str, str) else skills2_str)
-        
-        if skills1 and skills2:
-            skill_overlap = len(skills1.intersection(skills2))
-            skill_union = len(skills1.union(skills2))
-            similarity_factors["skill_similarity"] = skill_overlap / skill_union if skill_union > 0 else 0
-        else:
-            similarity_factors["skill_similarity"] = 0
-        
-        # Experience similarity
-        exp1 = profile1.get("years_of_experience", 0)
-        exp2 = profile2.get("years_of_experience", 0)
-        exp_diff = abs(exp1 - exp2)
-        similarity_factors["experience_similarity"] = max(0, 1 - exp_diff / 10)  # Normalize to 0-1
+    def _analyze_similarity(self, profile: Dict[str, Any],
+                            metadata_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Analyze similarity between an alumni profile and each matched profile"""
+        if not metadata_list:
+            return []
         
-        return similarity_factors
+        company = profile.get("current_company")
+        role = profile.get("current_role", "").lower()
+        role_tokens = frozenset(role.split())
+        
+        # Skills similarity: Jaccard over a (profiles x skills) indicator matrix
+        skills1 = set(profile.get("skills", []))
+        skill_sets = [skill_set(metadata.get("skills", "")) for metadata in metadata_list]
+        
+        vocab = {skill: i for i, skill in enumerate(skills1.union(*skill_sets))}
+        skill_matrix = np.zeros((len(skill_sets), len(vocab)), dtype=bool)
+        for row, skills2 in enumerate(skill_sets):
+            skill_matrix[row, [vocab[skill] for skill in skills2]] = True
+        query_skills = np.zeros(len(vocab), dtype=bool)
+        query_skills[[vocab[skill] for skill in skills1]] = True
+        
+        skill_overlap = (skill_matrix & query_skills).sum(axis=1)
+        skill_union = (skill_matrix | query_skills).sum(axis=1)
+        has_skills = skill_matrix.any(axis=1) & bool(skills1)
+        skill_similarity = np.zeros(len(skill_sets))
+        np.divide(skill_overlap, skill_union, out=skill_similarity, where=has_skills)
+        
+        # Experience similarity, normalized to 0-1
+        exp1 = profile.get("years_of_experience", 0)
+        exp2 = np.array([metadata.get("years_of_experience", 0) for metadata in metadata_list])
+        experience_similarity = np.maximum(0, 1 - np.abs(exp1 - exp2) / 10)
+        
+        analyses = []
+        for metadata, skill_score, experience_score in zip(
+            metadata_list, skill_similarity.tolist(), experience_similarity.tolist()
+        ):
+            similarity_factors = {}
+            
+            # Company similarity
+            if company == metadata.get("company"):
+                similarity_factors["same_company"] = True
+            
+            # Role similarity
+            similarity_factors["role_similarity"] = self._token_similarity(
+                role_tokens, metadata.get("role", "")
+            ) if role else 0.0
+            similarity_factors["skill_similarity"] = skill_score
+            similarity_factors["experience_similarity"] = experience_score
+            
+            analyses.append(similarity_factors)
+        
+        return analyses
     
     def _calculate_text_similarity(self, text1: str, text2: str) -> float:
         """Calculate similarity between two text strings"""
         if not text1 or not text2:
             return 0.0
         
-        words1 = set(text1.lower().split())
+        return self._token_similarity(frozenset(text1.lower().split()), text2)
+    
+    def _token_similarity(self, words1: frozenset, text2: str) -> float:
+        """Calculate similarity between already tokenized (lowercase) words and a text string"""
+        if not text2:
+            return 0.0
+        
         words2 = set(text2.lower().split())
         
         intersection = words1.intersection(words2)
@@ -557,10 +821,18 @@ class RAGPipeline:
         return len(intersection) / len(union) if union else 0.0
     
     def _post_process_semantic_results(self, results: List[Dict[str, Any]], 
-                                     search_criteria: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Post-process semantic search results"""
+                                     search_criteria: Dict[str, Any],
+                                     limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Post-process semantic search results, keeping the top `limit` when given"""
         processed_results = []
         
+        # Tokenize the criteria once instead of once per result
+        target_role = search_criteria.get("target_role")
+        target_role_tokens = frozenset(target_role.lower().split()) if target_role else None
+        target_company = search_criteria.get("target_company")
+        required_skills = search_criteria.get("required_skills")
+        required_skills_set = set(required_skills) if required_skills else None
+        
         for result in results:
             metadata = result.get("metadata", {})
             
@@ -569,28 +841,22 @@ class RAGPipeline:
             criteria_count = 0
             
             # Role relevance
-            if search_criteria.get("target_role"):
-                role_sim = self._calculate_text_similarity(
-                    search_criteria["target_role"],
-                    metadata.get("role", "")
-                )
+            if target_role:
+                role_sim = self._token_similarity(target_role_tokens, metadata.get("role", ""))
                 relevance_score += role_sim
                 criteria_count += 1
             
             # Company relevance
-            if search_criteria.get("target_company"):
-                if metadata.get("company") == search_criteria["target_company"]:
+            if target_company:
+                if metadata.get("company") == target_company:
                     relevance_score += 1.0
                 criteria_count += 1
             
             # Skills relevance
-            if search_criteria.get("required_skills"):
-                alumni_skills_str = metadata.get("skills", "")
-                alumni_skills = alumni_skills_str.split(", ") if isinstance(alumni_skills_str, str) else alumni_skills_str
-                
-                required_skills = search_criteria["required_skills"]
-                skill_matches = len(set(required_skills).intersection(set(alumni_skills)))
-                skill_relevance = skill_matches / len(required_skills) if required_skills else 0
+            if required_skills:
+                alumni_skills = skill_set(metadata.get("skills", ""))
+                skill_matches = len(required_skills_set.intersection(alumni_skills))
+                skill_relevance = skill_matches / len(required_skills)
                 
                 relevance_score += skill_relevance
                 criteria_count += 1
@@ -606,8 +872,11 @@ class RAGPipeline:
             
             processed_results.append(result)
         
-        # Sort by combined score
-        processed_results.sort(key=lambda x: x.get("combined_score", 0), reverse=True)
+        # Sort by combined score; only the top `limit` need ordering
+        if limit is not None:
+            return heapq.nlargest(limit, processed_results, key=itemgetter("combined_score"))
+        
+        processed_results.sort(key=itemgetter("combined_score"), reverse=True)
         
         return processed_results
     
@@ -625,40 +894,43 @@ class RAGPipeline:
             "fields_coverage": {}
         }
         
-        # Count field coverage
-        all_fields = set()
+        # Count field coverage, document types, companies and roles in one pass
+        field_counts = Counter()
+        types = Counter()
+        companies = Counter()
+        roles = Counter()
+        
         for metadata in metadata_list:
-            all_fields.update(metadata.keys())
+            for field, value in metadata.items():
+                field_counts[field] += 1 if value else 0
+            
+            types[metadata.get("type", "unknown")] += 1
+            if metadata.get("company"):
+                companies[metadata["company"]] += 1
+            if metadata.get("role"):
+                roles[metadata["role"]] += 1
         
-        for field in all_fields:
-            coverage = sum(1 for metadata in metadata_list if metadata.get(field))
+        for field, coverage in field_counts.items():
             analysis["fields_coverage"][field] = {
                 "count": coverage,
                 "percentage": (coverage / len(metadata_list)) * 100
             }
         
-        # Count document types
-        from collections import Counter
-        
-        types = [metadata.get("type", "unknown") for metadata in metadata_list]
-        analysis["document_types"] = dict(Counter(types))
-        
-        companies = [metadata.get("company", "unknown") for metadata in metadata_list if metadata.get("company")]
-        analysis["companies"] = dict(Counter(companies).most_common(10))
-        
-        roles = [metadata.get("role", "unknown") for metadata in metadata_list if metadata.get("role")]
-        analysis["roles"] = dict(Counter(roles).most_common(10))
+        analysis["document_types"] = dict(types)
+        analysis["companies"] = dict(companies.most_common(10))
+        analysis["roles"] = dict(roles.most_common(10))
         
         return analysis
     
     def clear_collection(self) -> bool:
         """Clear all documents from the collection"""
         try:
-            # Get all document IDs
-            all_docs = self.collection.get()
+            # Get all document IDs (ids only, no documents or metadata)
+            all_docs = self.collection.get(include=[])
             if all_docs["ids"]:
                 self.collection.delete(ids=all_docs["ids"])
             
+            self._invalidate_result_cache()
             logger.info("Cleared all documents from vector store")
             return True
             
@@ -676,6 +948,7 @@ class RAGPipeline:
                 metadata={"description": "Alumni profiles and network data"}
             )
             
+            self._invalidate_result_cache()
             logger.info("Reset vector store collection")
             return True
             
@@ -1,13 +1,42 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
 import time
 import random
 from typing import Dict, List, Any
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from config.settings import load_config
 
 logger = logging.getLogger(__name__)
 
+# Connection pool and retry policy for the shared HTTP session
+HTTP_POOL_CONNECTIONS = 32
+HTTP_POOL_MAXSIZE = 64
+HTTP_RETRIES = 3
+HTTP_BACKOFF_FACTOR = 0.3
+HTTP_RETRY_STATUSES = (502, 503, 504)
+
+# Pools for the simulated search results
+SAMPLE_COMPANIES = ("Google", "Microsoft", "Amazon", "Apple", "Meta", "Netflix", "Tesla", "Uber", "Airbnb", "Spotify")
+SAMPLE_COMPANIES_CASEFOLDED = tuple(company.casefold() for company in SAMPLE_COMPANIES)
+SAMPLE_ROLES = ("Software Engineer", "Senior Software Engineer", "Staff Engineer", "Engineering Manager", 
+                "Data Scientist", "Product Manager", "DevOps Engineer", "ML Engineer", "Tech Lead")
+SAMPLE_SKILLS = ("Python", "Java", "React", "Node.js", "AWS", "Docker", "Kubernetes", "Machine Learning", 
+                 "TypeScript", "Go", "PostgreSQL", "MongoDB", "Redis", "GraphQL", "REST APIs")
+ALUMNI_FIRST_NAMES = ("Alex", "Jordan", "Taylor", "Morgan", "Casey", "Riley", "Avery", "Quinn")
+ALUMNI_LAST_NAMES = ("Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis")
+ALUMNI_LOCATIONS = ("San Francisco, CA", "Seattle, WA", "New York, NY", "Austin, TX", "Boston, MA")
+EMAIL_DOMAINS = ("gmail.com", "outlook.com", "company.com")
+
+# Pools for the simulated company employee profiles
+EMPLOYEE_ROLES = ("Software Engineer", "Senior Software Engineer", "Principal Engineer", 
+                  "Engineering Manager", "Data Scientist", "Product Manager", "DevOps Engineer")
+EMPLOYEE_FIRST_NAMES = ("Sam", "Jamie", "Drew", "Blake", "Sage", "River", "Phoenix", "Rowan")
+EMPLOYEE_LAST_NAMES = ("Wilson", "Anderson", "Taylor", "Moore", "Jackson", "Martin", "Lee", "White")
+EMPLOYEE_LOCATIONS = ("San Francisco, CA", "Seattle, WA", "New York, NY", "Remote")
+
 class LinkedInScraper:
     """LinkedIn scraper for alumni data (simulation for demo purposes)"""
     
@@ -16,16 +45,31 @@ class LinkedInScraper:
         self.config = load_config()
         self.session = requests.Session()
         
+        # Keep connections alive across requests and retry transient gateway errors
+        adapter = HTTPAdapter(
+            pool_connections=HTTP_POOL_CONNECTIONS,
+            pool_maxsize=HTTP_POOL_MAXSIZE,
+            max_retries=Retry(
+                total=HTTP_RETRIES,
+                backoff_factor=HTTP_BACKOFF_FACTOR,
+                status_forcelist=HTTP_RETRY_STATUSES
+            )
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        
     def search_alumni(self, query: str) -> List[Dict[str, Any]]:
         """Search for alumni profiles (simulated data for demo)"""
         try:
             logger.info(f"Searching alumni with query: {query}")
             
-            # Simulate network delay
-            time.sleep(random.uniform(1, 3))
-            
-            # Generate simulated alumni data based on query
-            alumni_data = self._generate_sample_alumni_data(query)
+            # Generate simulated alumni data based on query on a worker thread,
+            # so it is ready by the time the simulated network delay ends
+            delay = random.uniform(1, 3)
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                future = executor.submit(self._generate_sample_alumni_data, query)
+                time.sleep(delay)
+                alumni_data = future.result()
             
             logger.info(f"Found {len(alumni_data)} alumni profiles")
             return alumni_data
@@ -37,53 +81,68 @@ class LinkedInScraper:
     def _generate_sample_alumni_data(self, query: str) -> List[Dict[str, Any]]:
         """Generate sample alumni data for demonstration"""
         
-        companies = ["Google", "Microsoft", "Amazon", "Apple", "Meta", "Netflix", "Tesla", "Uber", "Airbnb", "Spotify"]
-        roles = ["Software Engineer", "Senior Software Engineer", "Staff Engineer", "Engineering Manager", 
-                "Data Scientist", "Product Manager", "DevOps Engineer", "ML Engineer", "Tech Lead"]
-        skills = ["Python", "Java", "React", "Node.js", "AWS", "Docker", "Kubernetes", "Machine Learning", 
-                 "TypeScript", "Go", "PostgreSQL", "MongoDB", "Redis", "GraphQL", "REST APIs"]
-        
         sample_alumni = []
         
         # Parse query to influence generated data
-        query_lower = query.lower()
-        target_companies = [comp for comp in companies if comp.lower() in query_lower]
+        query_folded = query.casefold()
+        target_companies = [comp for comp, folded in zip(SAMPLE_COMPANIES, SAMPLE_COMPANIES_CASEFOLDED)
+                            if folded in query_folded]
         if not target_companies:
-            target_companies = companies[:5]  # Default selection
+            target_companies = SAMPLE_COMPANIES[:5]  # Default selection
         
         # Generate 15-25 sample profiles
         num_profiles = random.randint(15, 25)
         
+        # Draw every field for all profiles up front, one call per field
+        first_names = random.choices(ALUMNI_FIRST_NAMES, k=num_profiles)
+        last_names = random.choices(ALUMNI_LAST_NAMES, k=num_profiles)
+        graduation_years = random.choices(range(2018, 2024), k=num_profiles)
+        experience_offsets = random.choices(range(-1, 3), k=num_profiles)
+        current_companies = random.choices(target_companies, k=num_profiles)
+        current_roles = random.choices(SAMPLE_ROLES, k=num_profiles)
+        skill_counts = random.choices(range(5, 11), k=num_profiles)
+        locations = random.choices(ALUMNI_LOCATIONS, k=num_profiles)
+        url_suffixes = random.choices(range(100, 1000), k=num_profiles)
+        willing = random.choices((True, True, True, False), k=num_profiles)  # 75% willing
+        max_referrals = random.choices(range(2, 6), k=num_profiles)
+        referral_counts = random.choices(range(0, 3), k=num_profiles)
+        email_domains = random.choices(EMAIL_DOMAINS, k=num_profiles)
+        contact_methods = random.choices(("linkedin", "email"), k=num_profiles)
+        response_times = random.choices(("1-3 days", "2-5 days", "3-7 days"), k=num_profiles)
+        previous_companies = random.choices(SAMPLE_COMPANIES, k=num_profiles)
+        previous_roles = random.choices(SAMPLE_ROLES[:4], k=num_profiles)  # Earlier career roles
+        previous_durations = random.choices(range(1, 4), k=num_profiles)
+        
         for i in range(num_profiles):
-            name_first = random.choice(["Alex", "Jordan", "Taylor", "Morgan", "Casey", "Riley", "Avery", "Quinn"])
-            name_last = random.choice(["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis"])
+            name_first = first_names[i]
+            name_last = last_names[i]
             
-            graduation_year = random.choice(range(2018, 2024))
+            graduation_year = graduation_years[i]
             years_exp = 2025 - graduation_year - 1
             
             alumni = {
                 "name": f"{name_first} {name_last}",
                 "graduation_year": graduation_year,
-                "current_company": random.choice(target_companies),
-                "current_role": random.choice(roles),
-                "years_of_experience": max(0, years_exp + random.randint(-1, 2)),
-                "skills": random.sample(skills, random.randint(5, 10)),
+                "current_company": current_companies[i],
+                "current_role": current_roles[i],
+                "years_of_experience": max(0, years_exp + experience_offsets[i]),
+                "skills": random.sample(SAMPLE_SKILLS, skill_counts[i]),
                 "industry": "Technology",
-                "location": random.choice(["San Francisco, CA", "Seattle, WA", "New York, NY", "Austin, TX", "Boston, MA"]),
-                "linkedin_url": f"https://linkedin.com/in/{name_first.lower()}-{name_last.lower()}-{random.randint(100, 999)}",
-                "willing_to_refer": random.choice([True, True, True, False]),  # 75% willing
-                "max_referrals_per_month": random.randint(2, 5),
-                "referral_count_this_month": random.randint(0, 2),
-                "email": f"{name_first.lower()}.{name_last.lower()}@{random.choice(['gmail.com', 'outlook.com', 'company.com'])}",
+                "location": locations[i],
+                "linkedin_url": f"https://linkedin.com/in/{name_first.lower()}-{name_last.lower()}-{url_suffixes[i]}",
+                "willing_to_refer": willing[i],
+                "max_referrals_per_month": max_referrals[i],
+                "referral_count_this_month": referral_counts[i],
+                "email": f"{name_first.lower()}.{name_last.lower()}@{email_domains[i]}",
                 "contact_preferences": {
-                    "method": random.choice(["linkedin", "email"]),
-                    "response_time": random.choice(["1-3 days", "2-5 days", "3-7 days"])
+                    "method": contact_methods[i],
+                    "response_time": response_times[i]
                 },
                 "company_history": [
                     {
-                        "company": random.choice(companies),
-                        "role": random.choice(roles[:4]),  # Earlier career roles
-                        "duration": f"{random.randint(1, 3)} years"
+                        "company": previous_companies[i],
+                        "role": previous_roles[i],
+                        "duration": f"{previous_durations[i]} years"
                     }
                 ]
             }
@@ -184,18 +243,15 @@ class LinkedInScraper:
     
     def _generate_sample_employee(self, company_name: str) -> Dict[str, Any]:
         """Generate a sample employee profile"""
-        roles = ["Software Engineer", "Senior Software Engineer", "Principal Engineer", 
-                "Engineering Manager", "Data Scientist", "Product Manager", "DevOps Engineer"]
-        
-        name_first = random.choice(["Sam", "Jamie", "Drew", "Blake", "Sage", "River", "Phoenix", "Rowan"])
-        name_last = random.choice(["Wilson", "Anderson", "Taylor", "Moore", "Jackson", "Martin", "Lee", "White"])
+        name_first = random.choice(EMPLOYEE_FIRST_NAMES)
+        name_last = random.choice(EMPLOYEE_LAST_NAMES)
         
         return {
             "name": f"{name_first} {name_last}",
             "company": company_name,
-            "role": random.choice(roles),
+            "role": random.choice(EMPLOYEE_ROLES),
             "tenure": f"{random.randint(1, 8)} years",
-            "location": random.choice(["San Francisco, CA", "Seattle, WA", "New York, NY", "Remote"]),
+            "location": random.choice(EMPLOYEE_LOCATIONS),
             "profile_url": f"https://linkedin.com/in/{name_first.lower()}-{name_last.lower()}-{random.randint(100, 999)}",
             "is_alumni": random.choice([True, False]),
             "graduation_year": random.randint(2015, 2023) if random.choice([True, False]) else None
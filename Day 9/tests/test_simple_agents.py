@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+
+from agents.base_agent import BaseAgent
+from agents.simple_agents import SimpleLangChainAgent
+
+
+@pytest.fixture
+def domain_agent(monkeypatch):
+    """Simple domain agent without the database and Gemini setup"""
+    def init(self, agent_name):
+        self.agent_name = agent_name
+        self.config = {}
+        self.rag_pipeline = None
+    
+    monkeypatch.setattr(BaseAgent, "__init__", init)
+    monkeypatch.setattr(BaseAgent, "log_activity", lambda self, activity, data=None: None)
+    return SimpleLangChainAgent()
+
+
+def test_missing_company_and_role_score_neutral_without_targets(domain_agent):
+    student = {"skills": ["Python", "SQL"], "target_companies": [], "target_roles": [], "graduation_year": 2024}
+    alumni = [{
+        "alumni_id": "alumni_1",
+        "name": "Alex Smith",
+        "current_company": None,
+        "current_role": None,
+        "skills": ["Python"],
+        "years_of_experience": 5
+    }]
+    
+    result = asyncio.run(domain_agent.process({"student_profile": student, "alumni_profiles": alumni}))
+    
+    assert result["success"]
+    assert [match["alumni_id"] for match in result["matches"]] == ["alumni_1"]
+    breakdown = result["matches"][0]["score_breakdown"]
+    assert breakdown["company_alignment"] == 0.5
+    assert breakdown["role_relevance"] == 0.5
+    assert result["matches"][0]["compatibility_score"] == 0.55
+
+
+def test_match_cache_sees_edited_profiles(domain_agent):
+    student = {"skills": ["Python"], "target_companies": ["Google"], "target_roles": [], "graduation_year": 2024}
+    alumni = {
+        "alumni_id": "alumni_1",
+        "name": "Alex Smith",
+        "current_company": "Google",
+        "current_role": "Software Engineer",
+        "skills": ["Python"],
+        "years_of_experience": 5
+    }
+    
+    first = domain_agent._get_matches(student, [alumni])
+    alumni["current_company"] = "Meta"
+    second = domain_agent._get_matches(student, [alumni])
+    
+    assert first[0]["score_breakdown"]["company_alignment"] == 1.0
+    assert second[0]["current_company"] == "Meta"
+    assert second[0]["score_breakdown"]["company_alignment"] == 0.2
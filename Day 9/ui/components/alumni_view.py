@@ -1,7 +1,19 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
+import io
+from itertools import chain, compress
+from operator import itemgetter
 from typing import List, Dict, Any
 
+# Experience level buckets for the stats dashboard: upper edges of the
+# first three buckets (right-closed), the last one is open-ended
+EXPERIENCE_BIN_EDGES = (2, 5, 10)
+EXPERIENCE_LEVELS = ('0-2 years', '3-5 years', '6-10 years', '10+ years')
+
+# Skill tag markup for the detailed alumni view
+SKILL_TAG_TEMPLATE = '<span style="background-color: #f0f2f6; padding: 2px 8px; margin: 2px; border-radius: 12px; font-size: 12px;">{}</span> '
+
 def create_alumni_view(alumni_data: List[Dict[str, Any]]):
     """Create alumni view component"""
     
@@ -26,11 +38,19 @@ def create_alumni_view(alumni_data: List[Dict[str, Any]]):
         st.metric("Avg Experience", f"{avg_experience:.1f} years")
     
     with col3:
-        willing_to_refer = len([a for a in alumni_data if a.get('willing_to_refer', True)])
-        st.metric("Willing to Refer", f"{willing_to_refer}/{len(alumni_data)}")
+        # Profiles without the key are NaN here, and bool(NaN) is True, which
+        # matches the "willing unless told otherwise" default
+        if 'willing_to_refer' in df.columns:
+            willing_to_refer = int(df['willing_to_refer'].astype(bool).sum())
+        else:
+            willing_to_refer = len(df)
+        st.metric("Willing to Refer", f"{willing_to_refer}/{len(df)}")
     
     with col4:
-        avg_referrals = sum(a.get('max_referrals_per_month', 3) for a in alumni_data) / len(alumni_data)
+        if 'max_referrals_per_month' in df.columns:
+            avg_referrals = df['max_referrals_per_month'].fillna(3).mean()
+        else:
+            avg_referrals = 3
         st.metric("Avg Monthly Capacity", f"{avg_referrals:.1f}")
     
     # Search and filter
@@ -38,20 +58,22 @@ def create_alumni_view(alumni_data: List[Dict[str, Any]]):
     
     # Filter alumni based on search
     if search_term:
-        filtered_alumni = []
-        for alumni in alumni_data:
-            # Search in name, company, role, and skills
-            search_fields = [
-                alumni.get('name', ''),
-                alumni.get('current_company', ''),
-                alumni.get('current_role', ''),
-                ', '.join(alumni.get('skills', [])) if isinstance(alumni.get('skills'), list) else str(alumni.get('skills', ''))
-            ]
-            
-            if any(search_term.lower() in field.lower() for field in search_fields):
-                filtered_alumni.append(alumni)
+        # Search in name, company, role, and skills: join them into one haystack
+        # per alumni so there is a single casefold() and substring pass. The
+        # newline separator can't occur in the single-line search term, so
+        # matches never span two fields.
+        term = search_term.casefold()
+        fields = [df[column].fillna('').astype(str)
+                  for column in ['name', 'current_company', 'current_role'] if column in df.columns]
+        if 'skills' in df.columns:
+            fields.append(df['skills'].map(_skills_search_text))
+        if fields:
+            haystack = fields[0].str.cat(fields[1:], sep='\n') if len(fields) > 1 else fields[0]
+            mask = haystack.str.casefold().str.contains(term, regex=False, na=False)
+        else:
+            mask = pd.Series(False, index=df.index)
         
-        alumni_data = filtered_alumni
+        alumni_data = list(compress(alumni_data, mask))
         st.write(f"Found {len(alumni_data)} matching alumni")
     
     # Display options
@@ -64,6 +86,14 @@ def create_alumni_view(alumni_data: List[Dict[str, Any]]):
     else:  # Detailed
         _display_alumni_detailed(alumni_data)
 
+def _skills_search_text(skills) -> str:
+    """Searchable text for a skills cell (list, comma-joined string, or missing)"""
+    if isinstance(skills, list):
+        return ', '.join(skills)
+    if isinstance(skills, float) and pd.isna(skills):
+        return ''
+    return str(skills)
+
 def _display_alumni_cards(alumni_data: List[Dict[str, Any]]):
     """Display alumni in card format"""
     
@@ -122,29 +152,28 @@ def _display_alumni_table(alumni_data: List[Dict[str, Any]]):
     if not alumni_data:
         return
     
-    # Prepare data for table
-    table_data = []
-    for alumni in alumni_data:
-        row = {
-            'Name': alumni.get('name', 'Unknown'),
-            'Company': alumni.get('current_company', 'Unknown'),
-            'Role': alumni.get('current_role', 'Unknown'),
-            'Experience': f"{alumni.get('years_of_experience', 0)} years",
-            'Graduation': alumni.get('graduation_year', 'N/A'),
-            'Location': alumni.get('location', 'Unknown'),
-            'Willing to Refer': "Yes" if alumni.get('willing_to_refer', True) else "No",
-            'Skills Count': len(alumni.get('skills', [])) if isinstance(alumni.get('skills'), list) else 0
-        }
-        table_data.append(row)
-    
-    df = pd.DataFrame(table_data)
+    # Prepare data for table column by column, so pandas doesn't have to
+    # infer a schema from one dict per row
+    df = pd.DataFrame({
+        'Name': [alumni.get('name', 'Unknown') for alumni in alumni_data],
+        'Company': [alumni.get('current_company', 'Unknown') for alumni in alumni_data],
+        'Role': [alumni.get('current_role', 'Unknown') for alumni in alumni_data],
+        'Experience': [f"{alumni.get('years_of_experience', 0)} years" for alumni in alumni_data],
+        'Graduation': [alumni.get('graduation_year', 'N/A') for alumni in alumni_data],
+        'Location': [alumni.get('location', 'Unknown') for alumni in alumni_data],
+        'Willing to Refer': ["Yes" if alumni.get('willing_to_refer', True) else "No" for alumni in alumni_data],
+        'Skills Count': [len(alumni['skills']) if isinstance(alumni.get('skills'), list) else 0
+                         for alumni in alumni_data]
+    })
     st.dataframe(df, use_container_width=True)
     
-    # Download option
-    csv = df.to_csv(index=False)
+    # Download option - write straight into a buffer and hand Streamlit
+    # bytes, so it doesn't have to re-encode a large str
+    buffer = io.StringIO()
+    df.to_csv(buffer, index=False)
     st.download_button(
         label="📥 Download Alumni Data as CSV",
-        data=csv,
+        data=buffer.getvalue().encode('utf-8'),
         file_name="alumni_network.csv",
         mime="text/csv"
     )
@@ -199,9 +228,7 @@ def _display_single_alumni_detailed(alumni: Dict[str, Any]):
         skills = alumni['skills']
         if isinstance(skills, list):
             # Display skills as tags
-            skills_html = ""
-            for skill in skills:
-                skills_html += f'<span style="background-color: #f0f2f6; padding: 2px 8px; margin: 2px; border-radius: 12px; font-size: 12px;">{skill}</span> '
+            skills_html = ''.join(SKILL_TAG_TEMPLATE.format(skill) for skill in skills)
             st.markdown(skills_html, unsafe_allow_html=True)
         else:
             st.write(skills)
@@ -308,25 +335,31 @@ def create_alumni_comparison(alumni_list: List[Dict[str, Any]]):
     # Skill comparison
     st.subheader("Skills Comparison")
     
-    all_skills = set()
+    alumni_skills = []
     for alumni in alumni_list:
         skills = alumni.get('skills', [])
-        if isinstance(skills, list):
-            all_skills.update(skills)
-        elif isinstance(skills, str):
-            all_skills.update(skills.split(', '))
+        if isinstance(skills, str):
+            skills = skills.split(', ')
+        alumni_skills.append(skills if isinstance(skills, list) else [])
+    
+    # Give each distinct skill a bit, and each alumni a bitmask of their skills
+    all_skills = sorted(set().union(*alumni_skills))
+    skill_bits = {skill: 1 << i for i, skill in enumerate(all_skills)}
+    skill_masks = []
+    for skills in alumni_skills:
+        mask = 0
+        for skill in skills:
+            mask |= skill_bits[skill]
+        skill_masks.append(mask)
+    names = [alumni.get('name', 'Unknown') for alumni in alumni_list]
     
     # Create skills matrix
     skills_matrix = []
-    for skill in sorted(all_skills):
+    for skill in all_skills:
+        bit = skill_bits[skill]
         row = {'Skill': skill}
-        for alumni in alumni_list:
-            alumni_skills = alumni.get('skills', [])
-            if isinstance(alumni_skills, str):
-                alumni_skills = alumni_skills.split(', ')
-            
-            has_skill = skill in alumni_skills if isinstance(alumni_skills, list) else False
-            row[alumni.get('name', 'Unknown')] = '✅' if has_skill else '❌'
+        for name, mask in zip(names, skill_masks):
+            row[name] = '✅' if mask & bit else '❌'
         
         skills_matrix.append(row)
     
@@ -339,44 +372,47 @@ def create_alumni_comparison(alumni_list: List[Dict[str, Any]]):
     
     # Simple scoring for recommendation
     scores = []
-    for alumni in alumni_list:
-        score = 0
-        
-        # Experience score (0-30)
-        exp = alumni.get('years_of_experience', 0)
-        score += min(exp * 3, 30)
-        
-        # Availability score (0-25)
-        max_ref = alumni.get('max_referrals_per_month', 3)
-        current_ref = alumni.get('referral_count_this_month', 0)
-        availability = max_ref - current_ref
-        score += (availability / max_ref) * 25 if max_ref > 0 else 0
-        
-        # Willingness score (0-20)
-        if alumni.get('willing_to_refer', True):
-            score += 20
-        
-        # Skills score (0-25)
-        skill_count = len(alumni.get('skills', [])) if isinstance(alumni.get('skills'), list) else 0
-        score += min(skill_count * 2, 25)
-        
+    for alumni, score in zip(alumni_list, _recommendation_scores(alumni_list).tolist()):
         scores.append({
             'Alumni': alumni.get('name', 'Unknown'),
             'Score': round(score, 1),
             'Recommendation': 'Highly Recommended' if score >= 80 else 'Recommended' if score >= 60 else 'Consider'
         })
     
-    # Sort by score
-    scores.sort(key=lambda x: x['Score'], reverse=True)
-    
-    score_df = pd.DataFrame(scores)
+    # Sort by score for display
+    score_df = pd.DataFrame(scores).sort_values('Score', ascending=False, kind='stable', ignore_index=True)
     st.dataframe(score_df, use_container_width=True)
     
     # Best choice highlight
     if scores:
-        best_choice = scores[0]
+        best_choice = max(scores, key=itemgetter('Score'))
         st.success(f"🏆 **Best Choice:** {best_choice['Alumni']} (Score: {best_choice['Score']}/100)")
 
+def _recommendation_scores(alumni_list: List[Dict[str, Any]]) -> np.ndarray:
+    """Score each alumni out of 100 for the comparison recommendation, column-wise"""
+    experience = np.array([a.get('years_of_experience', 0) for a in alumni_list], dtype=float)
+    max_refs = np.array([a.get('max_referrals_per_month', 3) for a in alumni_list], dtype=float)
+    current_refs = np.array([a.get('referral_count_this_month', 0) for a in alumni_list], dtype=float)
+    willing = np.array([bool(a.get('willing_to_refer', True)) for a in alumni_list])
+    skill_counts = np.array([len(a['skills']) if isinstance(a.get('skills'), list) else 0
+                             for a in alumni_list], dtype=float)
+    
+    # Experience score (0-30)
+    scores = np.minimum(experience * 3, 30)
+    
+    # Availability score (0-25)
+    availability = np.zeros(len(alumni_list))
+    np.divide(max_refs - current_refs, max_refs, out=availability, where=max_refs > 0)
+    scores += availability * 25
+    
+    # Willingness score (0-20)
+    scores += np.where(willing, 20, 0)
+    
+    # Skills score (0-25)
+    scores += np.minimum(skill_counts * 2, 25)
+    
+    return scores
+
 def create_alumni_stats(alumni_data: List[Dict[str, Any]]):
     """Create alumni statistics dashboard"""
     
@@ -427,24 +463,26 @@ def create_alumni_stats(alumni_data: List[Dict[str, Any]]):
     
     with tab2:
         if 'years_of_experience' in df.columns:
-            # Create experience level bins
-            df['exp_level'] = pd.cut(df['years_of_experience'], 
-                                   bins=[0, 2, 5, 10, float('inf')], 
-                                   labels=['0-2 years', '3-5 years', '6-10 years', '10+ years'])
-            exp_counts = df['exp_level'].value_counts()
+            # Bucket experience into (0, 2], (2, 5], (5, 10], (10, inf) in one
+            # digitize pass; zero, negative and missing years fall outside every bin
+            years = df['years_of_experience'].to_numpy(dtype=float)
+            binned = np.digitize(years[years > 0], EXPERIENCE_BIN_EDGES, right=True)
+            exp_counts = pd.Series(
+                np.bincount(binned, minlength=len(EXPERIENCE_LEVELS)),
+                index=pd.Index(EXPERIENCE_LEVELS, name='exp_level'),
+                name='count'
+            ).sort_values(ascending=False, kind='stable')
             st.bar_chart(exp_counts)
         else:
             st.info("No experience data available")
     
     with tab3:
         # Skills analysis
-        all_skills = []
-        for alumni in alumni_data:
-            skills = alumni.get('skills', [])
-            if isinstance(skills, list):
-                all_skills.extend(skills)
-            elif isinstance(skills, str):
-                all_skills.extend(skills.split(', '))
+        skill_lists = (alumni.get('skills', []) for alumni in alumni_data)
+        all_skills = list(chain.from_iterable(
+            skills.split(', ') if isinstance(skills, str) else skills
+            for skills in skill_lists if isinstance(skills, (list, str))
+        ))
         
         if all_skills:
             skill_counts = pd.Series(all_skills).value_counts().head(15)
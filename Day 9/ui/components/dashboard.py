@@ -1,10 +1,31 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
 
+# How long chart aggregations stay cached across reruns
+AGGREGATION_CACHE_TTL_SECONDS = 300
+
+# How many built Plotly figures to keep across reruns
+FIGURE_CACHE_MAX_ENTRIES = 64
+
+REFERRAL_STATUS_COLORS = {
+    'successful': '#28a745',
+    'pending': '#ffc107', 
+    'contacted': '#17a2b8',
+    'responded': '#6f42c1',
+    'rejected': '#dc3545'
+}
+
+# Experience level buckets: (-inf, 2], (2, 5], (5, 10], (10, inf)
+EXPERIENCE_BIN_EDGES = [-np.inf, 2, 5, 10, np.inf]
+EXPERIENCE_LEVELS = np.array(['0-2 years', '3-5 years', '6-10 years', '10+ years'])
+
+NETWORK_COLUMNS = ['company', 'alumni_count', 'role_diversity', 'avg_experience', 'network_strength']
+
 def create_dashboard(data: Dict[str, List[Dict[str, Any]]]):
     """Create the main dashboard with visualizations"""
     
@@ -74,64 +95,35 @@ def _create_alumni_charts(alumni: List[Dict[str, Any]]):
     
     with col1:
         # Alumni by company
-        companies = [a.get('current_company', 'Unknown') for a in alumni]
-        company_counts = pd.Series(companies).value_counts().head(10)
+        companies = tuple(a.get('current_company', 'Unknown') for a in alumni)
+        company_counts = _value_counts(companies, limit=10)
         
-        fig = px.bar(
-            x=company_counts.values,
-            y=company_counts.index,
-            orientation='h',
-            title="Top 10 Companies by Alumni Count",
-            labels={'x': 'Number of Alumni', 'y': 'Company'}
+        fig = _bar_figure(
+            tuple(company_counts.items()),
+            "Top 10 Companies by Alumni Count",
+            ('Number of Alumni', 'Company'),
+            horizontal=True
         )
-        fig.update_layout(height=400)
         st.plotly_chart(fig, use_container_width=True)
     
     with col2:
         # Alumni by experience level
-        experience_ranges = []
-        for a in alumni:
-            exp = a.get('years_of_experience', 0)
-            if exp <= 2:
-                experience_ranges.append('0-2 years')
-            elif exp <= 5:
-                experience_ranges.append('3-5 years')
-            elif exp <= 10:
-                experience_ranges.append('6-10 years')
-            else:
-                experience_ranges.append('10+ years')
-        
-        exp_counts = pd.Series(experience_ranges).value_counts()
+        exp_counts = _experience_buckets(tuple(a.get('years_of_experience', 0) for a in alumni))
         
-        fig = px.pie(
-            values=exp_counts.values,
-            names=exp_counts.index,
-            title="Alumni by Experience Level"
-        )
-        fig.update_layout(height=400)
+        fig = _pie_figure(tuple(exp_counts.items()), "Alumni by Experience Level")
         st.plotly_chart(fig, use_container_width=True)
     
     # Skills analysis
     st.subheader("Popular Skills Among Alumni")
-    all_skills = []
-    for a in alumni:
-        skills = a.get('skills', [])
-        if isinstance(skills, list):
-            all_skills.extend(skills)
-        elif isinstance(skills, str):
-            all_skills.extend(skills.split(', '))
-    
-    if all_skills:
-        skill_counts = pd.Series(all_skills).value_counts().head(15)
-        
-        fig = px.bar(
-            x=skill_counts.index,
-            y=skill_counts.values,
-            title="Top 15 Skills in Alumni Network",
-            labels={'x': 'Skills', 'y': 'Frequency'}
+    skill_counts = _flattened_counts(tuple(a.get('skills', []) for a in alumni), limit=15)
+    
+    if not skill_counts.empty:
+        fig = _bar_figure(
+            tuple(skill_counts.items()),
+            "Top 15 Skills in Alumni Network",
+            ('Skills', 'Frequency'),
+            tick_angle=45
         )
-        fig.update_xaxes(tickangle=45)
-        fig.update_layout(height=400)
         st.plotly_chart(fig, use_container_width=True)
 
 def _create_referral_charts(referrals: List[Dict[str, Any]]):
@@ -144,39 +136,21 @@ def _create_referral_charts(referrals: List[Dict[str, Any]]):
     
     with col1:
         # Referral status distribution
-        statuses = [r.get('status', 'unknown') for r in referrals]
-        status_counts = pd.Series(statuses).value_counts()
-        
-        colors = {
-            'successful': '#28a745',
-            'pending': '#ffc107', 
-            'contacted': '#17a2b8',
-            'responded': '#6f42c1',
-            'rejected': '#dc3545'
-        }
+        status_counts = _value_counts(tuple(r.get('status', 'unknown') for r in referrals))
         
-        fig = px.pie(
-            values=status_counts.values,
-            names=status_counts.index,
-            title="Referral Status Distribution",
-            color=status_counts.index,
-            color_discrete_map=colors
+        fig = _pie_figure(
+            tuple(status_counts.items()),
+            "Referral Status Distribution",
+            color_map=tuple(REFERRAL_STATUS_COLORS.items())
         )
-        fig.update_layout(height=400)
         st.plotly_chart(fig, use_container_width=True)
     
     with col2:
         # Match scores distribution
-        scores = [r.get('match_score', 0) for r in referrals if r.get('match_score')]
+        scores = tuple(r.get('match_score', 0) for r in referrals if r.get('match_score'))
         
         if scores:
-            fig = px.histogram(
-                x=scores,
-                nbins=20,
-                title="Distribution of Match Scores",
-                labels={'x': 'Match Score', 'y': 'Count'}
-            )
-            fig.update_layout(height=400)
+            fig = _match_score_figure(scores)
             st.plotly_chart(fig, use_container_width=True)
         else:
             st.info("No match score data available.")
@@ -185,35 +159,10 @@ def _create_referral_charts(referrals: List[Dict[str, Any]]):
     if referrals and any(r.get('created_at') for r in referrals):
         st.subheader("Referral Trends Over Time")
         
-        # Create time series data
-        dates = []
-        for r in referrals:
-            created_at = r.get('created_at')
-            if created_at:
-                if isinstance(created_at, str):
-                    try:
-                        dates.append(datetime.fromisoformat(created_at.replace('Z', '+00:00')))
-                    except:
-                        dates.append(datetime.now())
-                else:
-                    dates.append(created_at)
+        daily_counts = _daily_counts(tuple(r.get('created_at') for r in referrals))
         
-        if dates:
-            df = pd.DataFrame({'date': dates})
-            df['date'] = pd.to_datetime(df['date'])
-            df['count'] = 1
-            
-            # Group by day
-            daily_counts = df.groupby(df['date'].dt.date)['count'].sum().reset_index()
-            
-            fig = px.line(
-                daily_counts,
-                x='date',
-                y='count',
-                title="Daily Referral Requests",
-                labels={'date': 'Date', 'count': 'Number of Referrals'}
-            )
-            fig.update_layout(height=300)
+        if daily_counts is not None:
+            fig = _daily_referrals_figure(tuple(daily_counts.itertuples(index=False, name=None)))
             st.plotly_chart(fig, use_container_width=True)
 
 def _create_student_charts(students: List[Dict[str, Any]]):
@@ -226,52 +175,33 @@ def _create_student_charts(students: List[Dict[str, Any]]):
     
     with col1:
         # Students by graduation year
-        grad_years = [s.get('graduation_year', 2024) for s in students]
-        year_counts = pd.Series(grad_years).value_counts().sort_index()
+        year_counts = _value_counts(tuple(s.get('graduation_year', 2024) for s in students)).sort_index()
         
-        fig = px.bar(
-            x=year_counts.index,
-            y=year_counts.values,
-            title="Students by Graduation Year",
-            labels={'x': 'Graduation Year', 'y': 'Number of Students'}
+        fig = _bar_figure(
+            tuple(year_counts.items()),
+            "Students by Graduation Year",
+            ('Graduation Year', 'Number of Students')
         )
-        fig.update_layout(height=400)
         st.plotly_chart(fig, use_container_width=True)
     
     with col2:
         # Students by major
-        majors = [s.get('major', 'Unknown') for s in students]
-        major_counts = pd.Series(majors).value_counts().head(8)
+        major_counts = _value_counts(tuple(s.get('major', 'Unknown') for s in students), limit=8)
         
-        fig = px.pie(
-            values=major_counts.values,
-            names=major_counts.index,
-            title="Students by Major"
-        )
-        fig.update_layout(height=400)
+        fig = _pie_figure(tuple(major_counts.items()), "Students by Major")
         st.plotly_chart(fig, use_container_width=True)
     
     # Target companies analysis
     st.subheader("Popular Target Companies")
-    all_targets = []
-    for s in students:
-        targets = s.get('target_companies', [])
-        if isinstance(targets, list):
-            all_targets.extend(targets)
-        elif isinstance(targets, str):
-            all_targets.extend(targets.split(', '))
-    
-    if all_targets:
-        target_counts = pd.Series(all_targets).value_counts().head(10)
-        
-        fig = px.bar(
-            x=target_counts.index,
-            y=target_counts.values,
-            title="Top 10 Target Companies",
-            labels={'x': 'Company', 'y': 'Number of Students Interested'}
+    target_counts = _flattened_counts(tuple(s.get('target_companies', []) for s in students), limit=10)
+    
+    if not target_counts.empty:
+        fig = _bar_figure(
+            tuple(target_counts.items()),
+            "Top 10 Target Companies",
+            ('Company', 'Number of Students Interested'),
+            tick_angle=45
         )
-        fig.update_xaxes(tickangle=45)
-        fig.update_layout(height=400)
         st.plotly_chart(fig, use_container_width=True)
 
 def _create_company_charts(alumni: List[Dict[str, Any]], companies: List[Dict[str, Any]]):
@@ -280,29 +210,101 @@ def _create_company_charts(alumni: List[Dict[str, Any]], companies: List[Dict[st
         st.info("No alumni data available for company analysis.")
         return
     
-    # Company size analysis
-    company_alumni_count = {}
-    for a in alumni:
-        company = a.get('current_company', 'Unknown')
-        company_alumni_count[company] = company_alumni_count.get(company, 0) + 1
-    
     # Network strength visualization
     st.subheader("Alumni Network Strength by Company")
     
+    df = _network_strength_df(tuple(
+        (a.get('current_company', 'Unknown'), a.get('current_role', ''), a.get('years_of_experience', 0))
+        for a in alumni
+    ))
+    
+    if not df.empty:
+        fig = _network_figure(tuple(df[NETWORK_COLUMNS].itertuples(index=False, name=None)))
+        st.plotly_chart(fig, use_container_width=True)
+        
+        # Top companies table
+        st.subheader("Top 10 Companies by Network Strength")
+        display_df = df[NETWORK_COLUMNS].copy()
+        display_df.columns = ['Company', 'Alumni Count', 'Role Diversity', 'Avg Experience', 'Network Strength']
+        display_df['Network Strength'] = display_df['Network Strength'].round(2)
+        display_df['Avg Experience'] = display_df['Avg Experience'].round(1)
+        
+        st.dataframe(display_df, use_container_width=True)
+
+@st.cache_data(ttl=AGGREGATION_CACHE_TTL_SECONDS)
+def _value_counts(values: Tuple, limit: Optional[int] = None) -> pd.Series:
+    """Count each value, most common first, optionally keeping only the top `limit`"""
+    counts = pd.Series(values).value_counts()
+    return counts.head(limit) if limit else counts
+
+@st.cache_data(ttl=AGGREGATION_CACHE_TTL_SECONDS)
+def _flattened_counts(values: Tuple, limit: Optional[int] = None) -> pd.Series:
+    """Count items across list or comma-separated string values, most common first"""
+    items = []
+    for value in values:
+        if isinstance(value, list):
+            items.extend(value)
+        elif isinstance(value, str):
+            items.extend(value.split(', '))
+    
+    return _value_counts(tuple(items), limit)
+
+@st.cache_data(ttl=AGGREGATION_CACHE_TTL_SECONDS)
+def _experience_buckets(years: Tuple) -> pd.Series:
+    """Count alumni per experience level"""
+    # Missing years (None) count as no experience
+    years = np.nan_to_num(np.array(years, dtype=float), nan=0)
+    bucket_codes = pd.cut(years, bins=EXPERIENCE_BIN_EDGES, labels=False)
+    
+    return pd.Series(EXPERIENCE_LEVELS[bucket_codes]).value_counts()
+
+@st.cache_data(ttl=AGGREGATION_CACHE_TTL_SECONDS)
+def _daily_counts(timestamps: Tuple) -> Optional[pd.DataFrame]:
+    """Count timestamps per day, or None if there are none"""
+    dates = []
+    for created_at in timestamps:
+        if created_at:
+            if isinstance(created_at, str):
+                try:
+                    dates.append(datetime.fromisoformat(created_at.replace('Z', '+00:00')))
+                except:
+                    dates.append(datetime.now())
+            else:
+                dates.append(created_at)
+    
+    if not dates:
+        return None
+    
+    df = pd.DataFrame({'date': dates})
+    df['date'] = pd.to_datetime(df['date'])
+    df['count'] = 1
+    
+    # Group by day
+    return df.groupby(df['date'].dt.date)['count'].sum().reset_index()
+
+@st.cache_data(ttl=AGGREGATION_CACHE_TTL_SECONDS)
+def _network_strength_df(alumni_rows: Tuple) -> pd.DataFrame:
+    """Top 10 companies by network strength from (company, role, experience) rows"""
+    # Group alumni by company in one pass, keeping first-seen company order
+    company_roles = {}
+    company_experience = {}
+    for company, role, experience in alumni_rows:
+        company_roles.setdefault(company, []).append(role)
+        company_experience.setdefault(company, []).append(experience)
+    
     network_data = []
-    for company, count in company_alumni_count.items():
+    for company, roles in company_roles.items():
         # Calculate network strength based on alumni count and diversity
-        alumni_in_company = [a for a in alumni if a.get('current_company') == company]
+        count = len(roles)
+        role_diversity = len(set(roles))
+        avg_experience = sum(company_experience[company]) / count
         
-        roles = set(a.get('current_role', '') for a in alumni_in_company)
-        avg_experience = sum(a.get('years_of_experience', 0) for a in alumni_in_company) / len(alumni_in_company)
-        
-        network_strength = count * len(roles) * (avg_experience / 10)  # Composite score
+        network_strength = count * role_diversity * (avg_experience / 10)  # Composite score
         
         network_data.append({
             'company': company,
             'alumni_count': count,
-            'role_diversity': len(roles),
+            'role_diversity': role_diversity,
             'avg_experience': avg_experience,
             'network_strength': network_strength
         })
@@ -310,37 +312,88 @@ def _create_company_charts(alumni: List[Dict[str, Any]], companies: List[Dict[st
     # Sort by network strength
     network_data.sort(key=lambda x: x['network_strength'], reverse=True)
     
-    # Display top companies
-    top_companies = network_data[:10]
-    
-    if top_companies:
-        df = pd.DataFrame(top_companies)
-        
-        fig = px.scatter(
-            df,
-            x='alumni_count',
-            y='avg_experience',
-            size='network_strength',
-            hover_name='company',
-            hover_data=['role_diversity'],
-            title="Company Network Analysis",
-            labels={
-                'alumni_count': 'Number of Alumni',
-                'avg_experience': 'Average Experience (years)',
-                'network_strength': 'Network Strength'
-            }
-        )
-        fig.update_layout(height=500)
-        st.plotly_chart(fig, use_container_width=True)
-        
-        # Top companies table
-        st.subheader("Top 10 Companies by Network Strength")
-        display_df = df[['company', 'alumni_count', 'role_diversity', 'avg_experience', 'network_strength']].copy()
-        display_df.columns = ['Company', 'Alumni Count', 'Role Diversity', 'Avg Experience', 'Network Strength']
-        display_df['Network Strength'] = display_df['Network Strength'].round(2)
-        display_df['Avg Experience'] = display_df['Avg Experience'].round(1)
-        
-        st.dataframe(display_df, use_container_width=True)
+    # Keep the top companies
+    return pd.DataFrame(network_data[:10])
+
+@st.cache_resource(max_entries=FIGURE_CACHE_MAX_ENTRIES)
+def _bar_figure(items: Tuple[Tuple[Any, int], ...], title: str, labels: Tuple[str, str],
+                horizontal: bool = False, tick_angle: Optional[int] = None) -> go.Figure:
+    """Bar chart of (label, count) pairs; labels are the (x, y) axis titles"""
+    names = [name for name, _ in items]
+    counts = [count for _, count in items]
+    
+    if horizontal:
+        fig = px.bar(x=counts, y=names, orientation='h', title=title,
+                     labels={'x': labels[0], 'y': labels[1]})
+    else:
+        fig = px.bar(x=names, y=counts, title=title,
+                     labels={'x': labels[0], 'y': labels[1]})
+    
+    if tick_angle is not None:
+        fig.update_xaxes(tickangle=tick_angle)
+    fig.update_layout(height=400)
+    return fig
+
+@st.cache_resource(max_entries=FIGURE_CACHE_MAX_ENTRIES)
+def _pie_figure(items: Tuple[Tuple[Any, int], ...], title: str,
+                color_map: Optional[Tuple[Tuple[str, str], ...]] = None) -> go.Figure:
+    """Pie chart of (label, count) pairs, optionally with fixed colors per label"""
+    names = [name for name, _ in items]
+    counts = [count for _, count in items]
+    
+    if color_map:
+        fig = px.pie(values=counts, names=names, title=title,
+                     color=names, color_discrete_map=dict(color_map))
+    else:
+        fig = px.pie(values=counts, names=names, title=title)
+    
+    fig.update_layout(height=400)
+    return fig
+
+@st.cache_resource(max_entries=FIGURE_CACHE_MAX_ENTRIES)
+def _match_score_figure(scores: Tuple[float, ...]) -> go.Figure:
+    """Histogram of referral match scores"""
+    fig = px.histogram(
+        x=list(scores),
+        nbins=20,
+        title="Distribution of Match Scores",
+        labels={'x': 'Match Score', 'y': 'Count'}
+    )
+    fig.update_layout(height=400)
+    return fig
+
+@st.cache_resource(max_entries=FIGURE_CACHE_MAX_ENTRIES)
+def _daily_referrals_figure(daily_counts: Tuple[Tuple[Any, int], ...]) -> go.Figure:
+    """Line chart of (date, count) referral totals"""
+    fig = px.line(
+        pd.DataFrame(list(daily_counts), columns=['date', 'count']),
+        x='date',
+        y='count',
+        title="Daily Referral Requests",
+        labels={'date': 'Date', 'count': 'Number of Referrals'}
+    )
+    fig.update_layout(height=300)
+    return fig
+
+@st.cache_resource(max_entries=FIGURE_CACHE_MAX_ENTRIES)
+def _network_figure(network_rows: Tuple[Tuple[Any, ...], ...]) -> go.Figure:
+    """Scatter of company network strength rows, in NETWORK_COLUMNS order"""
+    fig = px.scatter(
+        pd.DataFrame(list(network_rows), columns=NETWORK_COLUMNS),
+        x='alumni_count',
+        y='avg_experience',
+        size='network_strength',
+        hover_name='company',
+        hover_data=['role_diversity'],
+        title="Company Network Analysis",
+        labels={
+            'alumni_count': 'Number of Alumni',
+            'avg_experience': 'Average Experience (years)',
+            'network_strength': 'Network Strength'
+        }
+    )
+    fig.update_layout(height=500)
+    return fig
 
 def _is_recent(timestamp, days=7):
     """Check if timestamp is within the last N days"""
@@ -1,9 +1,14 @@
 import streamlit as st
 import pandas as pd
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 import plotly.express as px
 import plotly.graph_objects as go
 
+# How many built Plotly figures to keep across reruns
+FIGURE_CACHE_MAX_ENTRIES = 64
+
+EVALUATION_METRICS = ('accessibility', 'influence', 'responsiveness', 'relevance', 'timing')
+
 def create_referral_results(recommendations: List[Dict[str, Any]]):
     """Create referral results display component"""
     
@@ -221,27 +226,7 @@ def _display_single_recommendation_detailed(rec: Dict[str, Any]):
         evaluation = rec['evaluation']
         
         # Create radar chart for evaluation metrics
-        metrics = ['accessibility', 'influence', 'responsiveness', 'relevance', 'timing']
-        values = [evaluation.get(metric, 0) for metric in metrics]
-        
-        fig = go.Figure()
-        fig.add_trace(go.Scatterpolar(
-            r=values,
-            theta=[metric.title() for metric in metrics],
-            fill='toself',
-            name='Evaluation Scores'
-        ))
-        
-        fig.update_layout(
-            polar=dict(
-                radialaxis=dict(
-                    visible=True,
-                    range=[0, 1]
-                )),
-            showlegend=True,
-            height=400
-        )
-        
+        fig = _evaluation_radar_figure(tuple(evaluation.get(metric, 0) for metric in EVALUATION_METRICS))
         st.plotly_chart(fig, use_container_width=True)
     
     # Risk Factors
@@ -349,14 +334,7 @@ def _display_recommendation_analytics(recommendations: List[Dict[str, Any]]):
     
     with tab1:
         # Score distribution histogram
-        scores = [rec.get('score', 0) for rec in recommendations]
-        
-        fig = px.histogram(
-            x=scores,
-            nbins=10,
-            title="Score Distribution",
-            labels={'x': 'Score', 'y': 'Count'}
-        )
+        fig = _score_histogram_figure(tuple(rec.get('score', 0) for rec in recommendations))
         st.plotly_chart(fig, use_container_width=True)
     
     with tab2:
@@ -364,43 +342,83 @@ def _display_recommendation_analytics(recommendations: List[Dict[str, Any]]):
         path_types = [rec.get('type', 'unknown') for rec in recommendations]
         type_counts = pd.Series(path_types).value_counts()
         
-        fig = px.pie(
-            values=type_counts.values,
-            names=[name.replace('_', ' ').title() for name in type_counts.index],
-            title="Path Types Distribution"
-        )
+        fig = _path_types_figure(tuple(type_counts.items()))
         st.plotly_chart(fig, use_container_width=True)
     
     with tab3:
         # Success factors analysis
-        success_probs = [rec.get('success_probability', 0) for rec in recommendations]
-        connection_strengths = [rec.get('connection_strength', 0) for rec in recommendations]
-        scores = [rec.get('score', 0) for rec in recommendations]
-        
-        # Create DataFrame for scatter plot
-        scatter_data = pd.DataFrame({
-            'Success Probability': success_probs,
-            'Connection Strength': connection_strengths,
-            'Overall Score': scores,
-            'Alumni': [rec.get('alumni_details', [{}])[0].get('name', f'Alumni {i+1}') 
-                      for i, rec in enumerate(recommendations)]
-        })
-        
-        fig = px.scatter(
-            scatter_data,
-            x='Connection Strength',
-            y='Success Probability',
-            size='Overall Score',
-            hover_name='Alumni',
-            title="Success Factors Analysis",
-            labels={
-                'Connection Strength': 'Connection Strength',
-                'Success Probability': 'Success Probability',
-                'Overall Score': 'Overall Score'
-            }
-        )
+        fig = _success_factors_figure(tuple(
+            (rec.get('success_probability', 0),
+             rec.get('connection_strength', 0),
+             rec.get('score', 0),
+             rec.get('alumni_details', [{}])[0].get('name', f'Alumni {i+1}'))
+            for i, rec in enumerate(recommendations)
+        ))
         st.plotly_chart(fig, use_container_width=True)
 
+@st.cache_resource(max_entries=FIGURE_CACHE_MAX_ENTRIES)
+def _evaluation_radar_figure(values: Tuple[float, ...]) -> go.Figure:
+    """Radar chart of evaluation scores, in EVALUATION_METRICS order"""
+    fig = go.Figure()
+    fig.add_trace(go.Scatterpolar(
+        r=list(values),
+        theta=[metric.title() for metric in EVALUATION_METRICS],
+        fill='toself',
+        name='Evaluation Scores'
+    ))
+    
+    fig.update_layout(
+        polar=dict(
+            radialaxis=dict(
+                visible=True,
+                range=[0, 1]
+            )),
+        showlegend=True,
+        height=400
+    )
+    return fig
+
+@st.cache_resource(max_entries=FIGURE_CACHE_MAX_ENTRIES)
+def _score_histogram_figure(scores: Tuple[float, ...]) -> go.Figure:
+    """Histogram of recommendation scores"""
+    return px.histogram(
+        x=list(scores),
+        nbins=10,
+        title="Score Distribution",
+        labels={'x': 'Score', 'y': 'Count'}
+    )
+
+@st.cache_resource(max_entries=FIGURE_CACHE_MAX_ENTRIES)
+def _path_types_figure(type_counts: Tuple[Tuple[str, int], ...]) -> go.Figure:
+    """Pie chart of (path type, count) pairs"""
+    return px.pie(
+        values=[count for _, count in type_counts],
+        names=[name.replace('_', ' ').title() for name, _ in type_counts],
+        title="Path Types Distribution"
+    )
+
+@st.cache_resource(max_entries=FIGURE_CACHE_MAX_ENTRIES)
+def _success_factors_figure(rows: Tuple[Tuple[float, float, float, str], ...]) -> go.Figure:
+    """Scatter of (success probability, connection strength, score, alumni name) rows"""
+    scatter_data = pd.DataFrame(
+        list(rows),
+        columns=['Success Probability', 'Connection Strength', 'Overall Score', 'Alumni']
+    )
+    
+    return px.scatter(
+        scatter_data,
+        x='Connection Strength',
+        y='Success Probability',
+        size='Overall Score',
+        hover_name='Alumni',
+        title="Success Factors Analysis",
+        labels={
+            'Connection Strength': 'Connection Strength',
+            'Success Probability': 'Success Probability',
+            'Overall Score': 'Overall Score'
+        }
+    )
+
 def create_referral_summary(recommendations: List[Dict[str, Any]]):
     """Create a summary of referral recommendations"""
     
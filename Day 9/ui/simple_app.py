@@ -275,10 +275,11 @@ def show_alumni_demo(db_client):
     # Save sample data to database if available
     if db_client and st.button("💾 Save Demo Alumni to Database"):
         try:
+            created_at = datetime.now().isoformat()  # One timestamp for the whole batch
             for alumni in alumni_data:
                 alumni["alumni_id"] = f"alumni_{alumni['name'].replace(' ', '_').lower()}"
                 alumni["years_of_experience"] = 2024 - alumni["graduation_year"]
-                alumni["created_at"] = datetime.now().isoformat()
+                alumni["created_at"] = created_at
             
             inserted_ids = db_client.insert_many_documents("alumni", alumni_data)
             st.success(f"✅ Saved {len(inserted_ids)} alumni profiles to database!")
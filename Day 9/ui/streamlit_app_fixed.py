@@ -90,7 +90,13 @@ def initialize_rag():
     """Initialize RAG pipeline (cached)"""
     try:
         from rag.rag_pipeline import RAGPipeline
-        return RAGPipeline()
+        rag_pipeline = RAGPipeline()
+        # Pay the model load and index page-in at startup, not on the first search.
+        # The model and store load lazily, so this is also where a broken setup shows up.
+        if not rag_pipeline.warmup():
+            st.error("RAG Pipeline error: warmup failed")
+            return None
+        return rag_pipeline
     except Exception as e:
         st.error(f"RAG Pipeline error: {e}")
         return None
@@ -311,6 +317,7 @@ def show_alumni_network(db_client, agents, rag_pipeline):
                 sample_alumni = []
                 roles = ["Software Engineer", "Senior Engineer", "Engineering Manager", "Data Scientist", "Product Manager"]
                 skills = ["Python", "Java", "React", "AWS", "Machine Learning", "SQL", "Docker", "Kubernetes"]
+                created_at = datetime.now().isoformat()  # One timestamp for the whole batch
                 
                 for i in range(num_alumni):
                     alumni = {
@@ -324,7 +331,7 @@ def show_alumni_network(db_client, agents, rag_pipeline):
                         "industry": "Technology",
                         "willing_to_refer": random.choice([True, True, True, False]),
                         "max_referrals_per_month": random.randint(2, 5),
-                        "created_at": datetime.now().isoformat()
+                        "created_at": created_at
                     }
                     sample_alumni.append(alumni)
                 